@@ -1,7 +1,12 @@
 import random
 import pandas as pd
 import time
-import sys
+from hangman_engine import (HangmanGame, new_game, apply_guess, game_result,
+                            HIT, REPEAT, INVALID)
+from hangman_trace import TraceRecorder
+from hangman_telemetry import BatchTelemetry, metrics_port_from_env
+from results_store import write_run
+from sharded_vocab import ShardedVocab, shards_from_words, vocab_dir_from_env
 
 def checkWordContainsVowel(word):
     vowels = {'a', 'e', 'i', 'o', 'u'}
@@ -135,116 +140,116 @@ def get_bot_guess(guessed_letters):
             return letter
     return None
 
-def get_best_letter_from_likely_word(word_completion, guessed_letters, words, frequencies):
-    possible = []
-
-    for word, weight in zip(words, frequencies):
-        if len(word) != len(word_completion):
-            continue
-        match = True
-        for wc, actual in zip(word_completion, word):
-            if wc != '_' and wc != actual:
-                match = False
-                break
-            if wc == '_' and actual in guessed_letters:
-                match = False
-                break
-        if match:
-            possible.append((word, weight))
-    
-    if not possible:
-        return None  # fallback to letter ranking?
+    # --- Likely-word lookup over length shards (heaviest word first) ---
+def get_top_likely_words(word_completion, guessed_letters, shards, k=5):
+    shard = shards.get(len(word_completion))
+    if shard is None:
+        return []
+    return shard.top_likely_words(word_completion, guessed_letters, k)
 
-    # Sort by highest frequency
-    possible.sort(key=lambda x: x[1], reverse=True)
-    best_word = possible[0][0]
-
-    for letter in best_word:
-        if letter not in guessed_letters:
-            return letter
-
-    return None  # All letters already guessed
+def get_best_letter_from_likely_word(word_completion, guessed_letters, shards):
+    shard = shards.get(len(word_completion))
+    if shard is None:
+        return None  # fallback to letter ranking?
+    return shard.best_letter_from_likely_word(word_completion, guessed_letters)
+
+
+# --- Strategy for the bot players ---
+def choose_bot_guess(state, shards):
+    if state.attempts_remaining <= 2:
+        return get_best_letter_from_likely_word(
+            state.word_completion, state.guessed_letters, shards
+        )
+    return get_bot_guess(state.guessed_letters)
+
+
+# --- Batch games: rules only, no display ---
+def play_batch_game(word, shards, trace=None, game_id=0):
+    state = new_game(word, MAX_ATTEMPTS)
+
+    while not state.over:
+        start_time = time.perf_counter()
+        guess = choose_bot_guess(state, shards)
+        next_state, outcome = apply_guess(state, guess)
+        if outcome in (INVALID, REPEAT):
+            break  # Bot has nothing new to guess
+
+        if trace is not None:
+            latency_us = (time.perf_counter() - start_time) * 1e6
+            # Counted after timing, and only on request: it is a scan the bot never needs
+            candidates = -1
+            if trace.count_candidates and state.attempts_remaining <= 2:
+                shard = shards.get(len(word))
+                candidates = 0 if shard is None else shard.count_candidates(
+                    state.word_completion, state.guessed_letters)
+            trace.record_guess(game_id, len(state.guessed_letters), guess, int(outcome == HIT),
+                               candidates, latency_us)
+        state = next_state
+
+    if trace is not None:
+        trace.record_game(game_id, word, int(state.won))
+    return game_result(state)
 
 
 # --- Main game logic ---
-def hangman(player_type, words, frequencies):
-    guessed_letters = []
-    attempts_remaining = MAX_ATTEMPTS
-    word = random.choices(words, weights=frequencies, k=1)[0]
-    word_completion = "_" * len(word)
-
-    while attempts_remaining > 0 and "_" in word_completion:
-        if player_type != 'batch_bot':  # Only show visuals if not batch running
-            update_game_board(attempts_remaining, guessed_letters, word_completion)
-
-        if player_type in ['bot', 'batch_bot']:
-            if attempts_remaining <= 2:
-                guess = get_best_letter_from_likely_word(
-                    word_completion, guessed_letters, words, frequencies
-                )
-                if player_type != 'batch_bot':
-                    print("Bot is guessing strategically! with letter:", guess)
-            else:
-                guess = get_bot_guess(guessed_letters)
+def hangman(player_type, words, frequencies, trace=None, game_id=0, shards=None):
+    if words is None:
+        word = shards.sample_word()  # ShardedVocab: only the drawn length is loaded
+    else:
+        word = random.choices(words, weights=frequencies, k=1)[0]
+    if shards is None and player_type in ['bot', 'batch_bot']:
+        shards = shards_from_words(words, frequencies)
+    if player_type == 'batch_bot':
+        return play_batch_game(word, shards, trace, game_id)
+
+    game = HangmanGame(word, MAX_ATTEMPTS)
+
+    while not game.over:
+        state = game.state
+        update_game_board(state.attempts_remaining, state.guessed_letters, state.word_completion)
+
+        if player_type == 'bot':
+            guess = choose_bot_guess(state, shards)
+            if state.attempts_remaining <= 2:
+                print("Bot is guessing strategically! with letter:", guess)
         else:
             guess = input("Please guess a letter or type exit: ").lower()
 
         if guess == 'exit':
             print("Exiting the game.")
-            return {
-                "word": word,
-                "won": 0,
-                "word_length": len(word),
-                "attempts_used": MAX_ATTEMPTS - attempts_remaining,
-                "total_guesses": len(guessed_letters)
-            }
-
-        if len(guess) != 1 or not guess.isalpha():
-            if player_type != 'batch_bot':
-                print("Invalid input. Please enter a single letter.")
-            continue
-
-        if guess in guessed_letters:
-            if player_type != 'batch_bot':
-                print("You've already guessed that letter. Try again.")
-            continue
-
-        guessed_letters.append(guess)
-        guessed_letters.sort()
-
-        if guess in word:
-            if player_type != 'batch_bot':
-                print(f"Good guess! '{guess}' is in the word.")
+            return game_result(state, won=0)
+
+        outcome = game.apply_guess(guess)
+        if outcome == INVALID:
+            print("Invalid input. Please enter a single letter.")
+        elif outcome == REPEAT:
+            print("You've already guessed that letter. Try again.")
+        elif outcome == HIT:
+            print(f"Good guess! '{guess}' is in the word.")
         else:
-            if player_type != 'batch_bot':
-                print(f"Sorry, '{guess}' is not in the word.")
-            attempts_remaining -= 1
-
-        word_completion = "".join([letter if letter in guessed_letters else "_" for letter in word])
+            print(f"Sorry, '{guess}' is not in the word.")
 
-    if player_type != 'batch_bot':
-        update_game_board(attempts_remaining, guessed_letters, word_completion)
+    state = game.state
+    update_game_board(state.attempts_remaining, state.guessed_letters, state.word_completion)
 
-    won = int("_" not in word_completion)
-    if player_type != 'batch_bot':
-        if won:
-            print(f"Congratulations! You guessed the word: {word}")
-        else:
-            print(f"Game over! The word was: {word}")
+    if state.won:
+        print(f"Congratulations! You guessed the word: {word}")
+    else:
+        print(f"Game over! The word was: {word}")
 
-    return {
-        "word": word,
-        "won": won,
-        "word_length": len(word),
-        "attempts_used": MAX_ATTEMPTS - attempts_remaining,
-        "total_guesses": len(guessed_letters)
-    }
+    return game_result(state)
 
 
 # --- Game entry point ---
 def play_hangman():
     playAgain = True
-    words, frequencies = load_words()
+    vocab_dir = vocab_dir_from_env()
+    if vocab_dir:
+        words, frequencies = None, None
+        shards = ShardedVocab(vocab_dir)
+    else:
+        words, frequencies = load_words()
+        shards = shards_from_words(words, frequencies)
 
 
     print("Welcome to Hangman!")
@@ -272,17 +277,23 @@ def play_hangman():
             while num_games <= 0:
                 print("Invalid input. Please enter a positive number.")
                 num_games = int(input("Enter the number of games to run (default is 50,000): ") or 50000)
+            record_trace = input("Record a per-guess trace? (y/N): ").strip().lower() == 'y'
+            trace = None
+            if record_trace:
+                count = input("Also count candidate words per guess (slower)? (y/N): ").strip().lower() == 'y'
+                max_word_length = max(shards.lengths) if words is None else max(map(len, words))
+                trace = TraceRecorder("hangman_trace", count_candidates=count,
+                                      max_word_length=max_word_length)
             print("Running " + str(num_games) + " bot games...")
             results = []
-            
-            for i in range(num_games):
-                game_data = hangman(player_type, words, frequencies)
-                results.append(game_data)
-                
-                if i % (num_games/100) == 0:
-                    percent = (i / num_games) * 100
-                    sys.stdout.write(f"\rProgress: {percent:.1f}%")
-                    sys.stdout.flush()
+            telemetry = BatchTelemetry(num_games, metrics_file="hangman_batch_metrics.jsonl",
+                                       http_port=metrics_port_from_env())
+
+            with telemetry:
+                for i in range(num_games):
+                    game_data = hangman(player_type, words, frequencies, trace, i, shards=shards)
+                    results.append(game_data)
+                    telemetry.update(game_data)
 
             df = pd.DataFrame(results)
             win_rate = df["won"].mean()
@@ -294,10 +305,16 @@ def play_hangman():
             # Save to CSV
             df.to_csv("hangman_batch_results.csv", index=False)
             print("Results saved to hangman_batch_results.csv")
+            run_id = write_run(df, "bot")
+            print("Run stored as results_store/strategy=bot/run=" + run_id)
+
+            if trace is not None:
+                trace.close()
+                print("Per-guess trace saved to hangman_trace/ (replay with: python hangman_trace.py hangman_trace <game_id>)")
 
             playAgain = False
         else:
-            hangman(player_type, words, frequencies)
+            hangman(player_type, words, frequencies, shards=shards)
 
             print ("Do you want to play again?")
             print("Press 0 to exit, 1 to play again, or 2 to change player type")
@@ -318,4 +335,5 @@ def play_hangman():
                 player_input = input("Enter 1 or 2: ")
                 player_type = 'bot' if player_input == '2' else 'human'
 
-play_hangman()
\ No newline at end of file
+if __name__ == '__main__':
+    play_hangman()
@@ -4,6 +4,7 @@ import time
 import torch
 import numpy as np
 from collections import defaultdict, Counter
+from hangman_engine import HangmanGame, new_game, apply_guess, REPEAT
 
 # --- Device Setup ---
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
@@ -145,40 +146,31 @@ def ai_guess_gpu(dist_map, pattern, guessed, words, freqs):
 
 # --- Simulation Function ---
 def run_sim(word, words, freqs, dist_map):
-    guessed = []
-    attempts = MAX_ATTEMPTS
-    pattern = '_' * len(word)
-    while attempts > 0 and '_' in pattern:
-        guess = ai_guess_gpu(dist_map, pattern, guessed, words, freqs)
-        if guess in guessed: break
-        guessed.append(guess)
-        if guess not in word:
-            attempts -= 1
-        pattern = ''.join([c if c in guessed else '_' for c in word])
-    return '_' not in pattern
+    state = new_game(word, MAX_ATTEMPTS)
+    while not state.over:
+        guess = ai_guess_gpu(dist_map, state.word_completion, state.guessed_letters, words, freqs)
+        state, outcome = apply_guess(state, guess)
+        if outcome == REPEAT: break
+    return state.won
 
 # --- Main Hangman Logic ---
 def hangman(word, mode, words, freqs, dist_map):
-    guessed = []
-    attempts = MAX_ATTEMPTS
-    pattern = '_' * len(word)
-    while attempts > 0 and '_' in pattern:
-        update_game_board(attempts, guessed, pattern)
+    game = HangmanGame(word, MAX_ATTEMPTS)
+    while not game.over:
+        state = game.state
+        update_game_board(state.attempts_remaining, state.guessed_letters, state.word_completion)
         if mode == 'bot':
-            guess = random.choice([c for c in letter_ranking if c not in guessed]) if attempts > 2 else ai_guess_gpu(dist_map, pattern, guessed, words, freqs)
+            guess = random.choice([c for c in letter_ranking if c not in state.guessed_letters]) if state.attempts_remaining > 2 else ai_guess_gpu(dist_map, state.word_completion, state.guessed_letters, words, freqs)
         elif mode == 'ai':
-            guess = ai_guess_gpu(dist_map, pattern, guessed, words, freqs)
+            guess = ai_guess_gpu(dist_map, state.word_completion, state.guessed_letters, words, freqs)
         else:
             guess = input("Guess a letter or 'exit': ").lower()
             if guess == 'exit': return
         print(f"{mode.upper()} guesses: {guess}")
-        if not guess or len(guess) != 1 or guess in guessed or not guess.isalpha(): continue
-        guessed.append(guess)
-        if guess not in word:
-            attempts -= 1
-        pattern = ''.join([c if c in guessed else '_' for c in word])
-    update_game_board(attempts, guessed, pattern)
-    if '_' not in pattern:
+        game.apply_guess(guess)
+    state = game.state
+    update_game_board(state.attempts_remaining, state.guessed_letters, state.word_completion)
+    if state.won:
         print(f"Congrats! You guessed: {word}")
     else:
         print(f"Game over. The word was: {word}")
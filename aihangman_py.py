@@ -3,7 +3,12 @@ import random
 import pandas as pd
 import time
 import torch
-import sys
+from hangman_engine import (HangmanGame, new_game, apply_guess, game_result,
+                            HIT, REPEAT, INVALID)
+from hangman_trace import TraceRecorder
+from hangman_telemetry import BatchTelemetry, metrics_port_from_env
+from results_store import write_run
+from sharded_vocab import ShardedVocab, shards_from_words, vocab_dir_from_env
 from collections import defaultdict, Counter
 
 # --- Helper functions ---
@@ -121,25 +126,14 @@ def get_bot_guess(guessed_letters):
             return letter
     return None
 
-def get_best_letter_from_likely_word(word_completion, guessed_letters, words, frequencies):
-    possible = []
-    for w, wt in zip(words, frequencies):
-        if len(w) != len(word_completion):
-            continue
-        match = True
-        for wc, c in zip(word_completion, w):
-            if (wc != '_' and wc != c) or (wc == '_' and c in guessed_letters):
-                match = False
-                break
-        if match:
-            possible.append((w, wt))
-    if not possible:
-        return None
-    possible.sort(key=lambda x: x[1], reverse=True)
-    for c in possible[0][0]:
-        if c not in guessed_letters:
-            return c
-    return None
+# --- Likely-word lookup over length shards (heaviest word first) ---
+def get_top_likely_words(word_completion, guessed_letters, shards, k=5):
+    shard = shards.get(len(word_completion))
+    return [] if shard is None else shard.top_likely_words(word_completion, guessed_letters, k)
+
+def get_best_letter_from_likely_word(word_completion, guessed_letters, shards):
+    shard = shards.get(len(word_completion))
+    return None if shard is None else shard.best_letter_from_likely_word(word_completion, guessed_letters)
 
 # --- AI Distribution by Word Length ---
 def train_ai_by_word_length(words):
@@ -156,7 +150,7 @@ def train_ai_by_word_length(words):
     return dist
 
 # --- AI Guess using Pattern + Length Distribution ---
-def get_ai_guess_from_distribution(dist_map, word_completion, guessed_letters, words, frequencies):
+def get_ai_guess_from_distribution(dist_map, word_completion, guessed_letters, words, frequencies, stats=None):
     length = len(word_completion)
     # Filter matching words
     pattern_words = []
@@ -172,6 +166,8 @@ def get_ai_guess_from_distribution(dist_map, word_completion, guessed_letters, w
         if match:
             pattern_words.append(w)
             pattern_weights.append(wt)
+    if stats is not None:
+        stats['candidates'] = len(pattern_words)
     # Accumulate letter scores
     letter_scores = {}
     if pattern_words:
@@ -189,82 +185,128 @@ def get_ai_guess_from_distribution(dist_map, word_completion, guessed_letters, w
         return None
     return max(letter_scores, key=letter_scores.get)
 
+# --- Same AI rule over one length shard, for sharded vocabularies ---
+def get_ai_guess_from_shard(shard, word_completion, guessed_letters, stats=None):
+    letter_scores, matched = {}, 0
+    if shard is not None:
+        letter_scores, matched = shard.letter_scores(word_completion, guessed_letters)
+    if stats is not None:
+        stats['candidates'] = matched
+    if not matched and shard is not None:
+        # Fall back to the shard's letter shares, over its own alphabet
+        letter_scores = {c: share for c, share in shard.letter_distribution.items()
+                         if c not in guessed_letters}
+    elif not matched:
+        # No words of this length at all: uniform over a-z
+        for i in range(26):
+            c = chr(i + ord('a'))
+            if c not in guessed_letters:
+                letter_scores[c] = 1 / 26
+    if not letter_scores:
+        return None
+    return max(letter_scores, key=letter_scores.get)
+
+def get_ai_guess(ai_dist, word_completion, guessed_letters, words, frequencies, shards=None, stats=None):
+    if words is None:
+        shard = shards.get(len(word_completion))
+        return get_ai_guess_from_shard(shard, word_completion, guessed_letters, stats)
+    return get_ai_guess_from_distribution(ai_dist, word_completion, guessed_letters,
+                                          words, frequencies, stats)
+
+# --- Interactive bot and AI strategies ---
+def choose_guess(player_type, state, ai_dist, words, frequencies, shards=None):
+    if player_type == 'bot':
+        return get_best_letter_from_likely_word(state.word_completion, state.guessed_letters, shards) \
+            if state.attempts_remaining <= 2 else get_bot_guess(state.guessed_letters)
+    return get_ai_guess(ai_dist, state.word_completion, state.guessed_letters,
+                        words, frequencies, shards)
+
+
+# --- Batch games: rules only, no display ---
+def play_batch_game(word, ai_dist, words, frequencies, trace=None, game_id=0, shards=None):
+    state = new_game(word, MAX_ATTEMPTS)
+
+    while not state.over:
+        stats = {} if trace is not None else None
+        start_time = time.perf_counter()
+        guess = get_ai_guess(ai_dist, state.word_completion, state.guessed_letters,
+                             words, frequencies, shards, stats)
+        next_state, outcome = apply_guess(state, guess)
+        if outcome in (INVALID, REPEAT):
+            break  # AI has nothing new to guess
+
+        if trace is not None:
+            trace.record_guess(game_id, len(state.guessed_letters), guess, int(outcome == HIT),
+                               stats.get('candidates', -1),
+                               (time.perf_counter() - start_time) * 1e6)
+        state = next_state
+
+    if trace is not None:
+        trace.record_game(game_id, word, int(state.won))
+    return game_result(state)
+
+
 # --- Main Hangman Logic ---
-def hangman(player_type, words, frequencies):
-    guessed_letters = []
-    attempts_remaining = MAX_ATTEMPTS
-    word = random.choices(words, weights=frequencies, k=1)[0]
-    word_completion = "_" * len(word)
-    ai_dist = train_ai_by_word_length(words) if (player_type == 'ai' or player_type == 'batch_bot') else None
-
-    while attempts_remaining > 0 and "_" in word_completion:
-        if player_type != 'batch_bot':
-            update_game_board(attempts_remaining, guessed_letters, word_completion)
-
-        if player_type == 'bot':
-            guess = get_best_letter_from_likely_word(word_completion, guessed_letters, words, frequencies) \
-                if attempts_remaining <= 2 else get_bot_guess(guessed_letters)
-            print("Bot guesses:", guess)
-        elif player_type == 'ai':
-            guess = get_ai_guess_from_distribution(ai_dist, word_completion, guessed_letters, words, frequencies)
-            print("AI guesses:", guess)
-        elif player_type == 'human':
-            guess = input("Please guess a letter or type exit: ").lower()
+def hangman(player_type, words, frequencies, trace=None, game_id=0, ai_dist=None, shards=None):
+    if words is None:
+        word = shards.sample_word()  # ShardedVocab: only the drawn length is loaded
+    else:
+        word = random.choices(words, weights=frequencies, k=1)[0]
+        if shards is None and player_type == 'bot':
+            shards = shards_from_words(words, frequencies)
+        if ai_dist is None and (player_type == 'ai' or player_type == 'batch_bot'):
+            ai_dist = train_ai_by_word_length(words)
+    if player_type == 'batch_bot':
+        return play_batch_game(word, ai_dist, words, frequencies, trace, game_id, shards)
+
+    game = HangmanGame(word, MAX_ATTEMPTS)
+
+    while not game.over:
+        state = game.state
+        update_game_board(state.attempts_remaining, state.guessed_letters, state.word_completion)
+
+        if player_type in ('bot', 'ai'):
+            guess = choose_guess(player_type, state, ai_dist, words, frequencies, shards)
+            print("Bot guesses:" if player_type == 'bot' else "AI guesses:", guess)
         else:
-            guess = get_ai_guess_from_distribution(ai_dist, word_completion, guessed_letters, words, frequencies)
+            guess = input("Please guess a letter or type exit: ").lower()
+
         if guess == 'exit':
             print("Exiting the game.")
-            return {
-                "word": word,
-                "won": 0,
-                "word_length": len(word),
-                "attempts_used": MAX_ATTEMPTS - attempts_remaining,
-                "total_guesses": len(guessed_letters)
-            }
-
-        if not guess or len(guess) != 1 or not guess.isalpha():
-            print("Invalid input. Please enter a single letter.")
-            continue
+            return game_result(state, won=0)
 
-        if guess in guessed_letters:
+        outcome = game.apply_guess(guess)
+        if outcome == INVALID:
+            print("Invalid input. Please enter a single letter.")
+        elif outcome == REPEAT:
             print("You've already guessed that letter. Try again.")
-            continue
-
-        guessed_letters.append(guess)
-        guessed_letters.sort()
-
-        if guess in word:
-            if player_type != 'batch_bot':
-                print(f"Good guess! '{guess}' is in the word.")
+        elif outcome == HIT:
+            print(f"Good guess! '{guess}' is in the word.")
         else:
-            if player_type != 'batch_bot':
-                print(f"Sorry, '{guess}' is not in the word.")
-            attempts_remaining -= 1
+            print(f"Sorry, '{guess}' is not in the word.")
 
-        word_completion = "".join([letter if letter in guessed_letters else "_" for letter in word])
+    state = game.state
+    update_game_board(state.attempts_remaining, state.guessed_letters, state.word_completion)
 
-    if player_type != 'batch_bot':
-        update_game_board(attempts_remaining, guessed_letters, word_completion)
-
-    won = int("_" not in word_completion)
-    if player_type != 'batch_bot':
-        if won:
-            print(f"Congratulations! You guessed the word: {word}")
-        else:
-            print(f"Game over! The word was: {word}")
+    if state.won:
+        print(f"Congratulations! You guessed the word: {word}")
+    else:
+        print(f"Game over! The word was: {word}")
 
-    return {
-        "word": word,
-        "won": won,
-        "word_length": len(word),
-        "attempts_used": MAX_ATTEMPTS - attempts_remaining,
-        "total_guesses": len(guessed_letters)
-    }
+    return game_result(state)
 
 
 def play_hangman():
     playAgain = True
-    words, frequencies = load_words()
+    vocab_dir = vocab_dir_from_env()
+    if vocab_dir:
+        # Per-length letter shares come from the shards, so there is nothing to train
+        words, frequencies, ai_dist = None, None, None
+        shards = ShardedVocab(vocab_dir)
+    else:
+        words, frequencies = load_words()
+        ai_dist = train_ai_by_word_length(words)
+        shards = shards_from_words(words, frequencies)
 
     print("Welcome to Hangman!")
     time.sleep(1.5)
@@ -286,17 +328,21 @@ def play_hangman():
             while num_games <= 0:
                 print("Invalid input. Please enter a positive number.")
                 num_games = int(input("Enter the number of games to run (default is 50,000): ") or 50000)
+            record_trace = input("Record a per-guess trace? (y/N): ").strip().lower() == 'y'
+            trace = None
+            if record_trace:
+                max_word_length = max(shards.lengths) if words is None else max(map(len, words))
+                trace = TraceRecorder("hangmanAI_trace", max_word_length=max_word_length)
             print("Running " + str(num_games) + " bot games...")
             results = []
-            
-            for i in range(num_games):
-                game_data = hangman(player_type, words, frequencies)
-                results.append(game_data)
-                
-                if i % (num_games/100) == 0:
-                    percent = (i / num_games) * 100
-                    sys.stdout.write(f"\rProgress: {percent:.1f}%")
-                    sys.stdout.flush()
+            telemetry = BatchTelemetry(num_games, metrics_file="hangmanAI_batch_metrics.jsonl",
+                                       http_port=metrics_port_from_env())
+
+            with telemetry:
+                for i in range(num_games):
+                    game_data = hangman(player_type, words, frequencies, trace, i, ai_dist, shards=shards)
+                    results.append(game_data)
+                    telemetry.update(game_data)
 
             df = pd.DataFrame(results)
             win_rate = df["won"].mean()
@@ -308,10 +354,16 @@ def play_hangman():
             # Save to CSV
             df.to_csv("hangmanAItest1_batch_results.csv", index=False)
             print("Results saved to hangman_batch_results.csv")
+            run_id = write_run(df, "ai")
+            print("Run stored as results_store/strategy=ai/run=" + run_id)
+
+            if trace is not None:
+                trace.close()
+                print("Per-guess trace saved to hangmanAI_trace/ (replay with: python hangman_trace.py hangmanAI_trace <game_id>)")
 
             playAgain = False
         else:
-            hangman(player_type, words, frequencies, ai_dist)
+            hangman(player_type, words, frequencies, ai_dist=ai_dist, shards=shards)
 
             print("Do you want to play again?")
             print("Press 0 to exit, 1 to play again, or 2 to change player type")
@@ -338,4 +390,5 @@ def play_hangman():
 
 
 # --- Run the game ---
-play_hangman()
\ No newline at end of file
+if __name__ == '__main__':
+    play_hangman()
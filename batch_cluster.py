@@ -0,0 +1,312 @@
+import argparse
+import json
+import os
+import queue
+import random
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import pandas as pd
+from hangman_telemetry import BatchTelemetry, metrics_port_from_env
+from results_store import write_run
+from sharded_vocab import ShardedVocab
+
+RESULT_COLUMNS = ["word", "won", "word_length", "attempts_used", "total_guesses"]
+RESULT_FILES = {'bot': "hangman_batch_results.csv", 'ai': "hangmanAI_batch_results.csv"}
+
+
+# --- Wire protocol: 4-byte big-endian length + JSON body ---
+def send_message(sock, message):
+    body = json.dumps(message, separators=(',', ':')).encode()
+    sock.sendall(struct.pack('>I', len(body)) + body)
+
+
+def _recv_exact(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        data += chunk
+    return data
+
+
+def recv_message(sock):
+    (size,) = struct.unpack('>I', _recv_exact(sock, 4))
+    return json.loads(_recv_exact(sock, size))
+
+
+# --- Playing a seeded range of games ---
+def load_strategy(strategy, vocab_dir=None):
+    # Returns (words, frequencies, play) where play(words, frequencies) runs one batch game.
+    # With vocab_dir, words and frequencies are None and games draw from the shards.
+    if strategy == 'bot':
+        import Hangman as module
+    elif strategy == 'ai':
+        import aihangman_py as module  # Needs torch
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    if vocab_dir:
+        vocab = ShardedVocab(vocab_dir)
+        return None, None, lambda w, f: module.hangman('batch_bot', w, f, shards=vocab)
+    words, frequencies = module.load_words()
+    if strategy == 'ai':
+        ai_dist = module.train_ai_by_word_length(words)  # Trained once per worker
+        return words, frequencies, lambda w, f: module.hangman('batch_bot', w, f, ai_dist=ai_dist)
+    shards = module.shards_from_words(words, frequencies)  # Sorted once per worker
+    return words, frequencies, lambda w, f: module.hangman('batch_bot', w, f, shards=shards)
+
+
+def play_range(play, words, frequencies, seed, start, count):
+    # Each game gets its own seed, so a game's result does not depend on
+    # which worker (or a local run) played it
+    columns = {column: [] for column in RESULT_COLUMNS}
+    for game_index in range(start, start + count):
+        random.seed(f"{seed}:{game_index}")
+        game_data = play(words, frequencies)
+        for column in RESULT_COLUMNS:
+            columns[column].append(game_data[column])
+    return columns
+
+
+def run_local(strategy, num_games, seed=0, vocab_dir=None):
+    words, frequencies, play = load_strategy(strategy, vocab_dir)
+    return pd.DataFrame(play_range(play, words, frequencies, seed, 0, num_games))
+
+
+# --- Coordinator ---
+class Coordinator:
+    def __init__(self, strategy, num_games, unit_size=500, seed=0, host='127.0.0.1', port=5555,
+                 unit_timeout=600, vocab_dir=None):
+        self.strategy = strategy
+        self.vocab_dir = vocab_dir  # Must exist at the same path on every worker
+        self.num_games = num_games
+        self.seed = seed
+        self.unit_timeout = unit_timeout
+        self.units = [(start, min(unit_size, num_games - start))
+                      for start in range(0, num_games, unit_size)]
+        self.pending = queue.Queue()
+        for unit_id in range(len(self.units)):
+            self.pending.put(unit_id)
+        self.results = {}
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+        self.retries = 0
+        self.telemetry = BatchTelemetry(num_games, workers=0,
+                                        metrics_file=f"hangman_cluster_{strategy}_metrics.jsonl",
+                                        http_port=metrics_port_from_env())
+
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen()
+        self.port = self.server.getsockname()[1]
+
+    def serve(self, check=None):
+        # check(), if given, runs twice a second while waiting and may raise
+        # to abort the run, e.g. when every worker process has died
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        try:
+            with self.telemetry:
+                while not self.finished.wait(0.5):
+                    if check is not None:
+                        check()
+        finally:
+            self.finished.set()  # Stops the accept loop and sends connected workers home
+            self.server.close()
+        return self.results_table()
+
+    def _accept_loop(self):
+        while not self.finished.is_set():
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._handle_worker, args=(conn,), daemon=True).start()
+
+    def _next_unit(self):
+        while not self.finished.is_set():
+            try:
+                return self.pending.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return None
+
+    def _handle_worker(self, conn):
+        unit_id = None
+        try:
+            conn.settimeout(self.unit_timeout)
+            hello = recv_message(conn)
+            if hello.get("type") != "hello":
+                return
+            worker = self.telemetry.add_worker()
+            send_message(conn, {"type": "config", "strategy": self.strategy, "seed": self.seed,
+                                "vocab_dir": self.vocab_dir})
+            while True:
+                unit_id = self._next_unit()
+                if unit_id is None:
+                    send_message(conn, {"type": "done"})
+                    return
+                start, count = self.units[unit_id]
+                send_message(conn, {"type": "work", "unit": unit_id, "start": start, "count": count})
+                reply = recv_message(conn)
+                if reply.get("type") != "result" or reply.get("unit") != unit_id:
+                    raise ConnectionError(f"Unexpected reply from worker: {reply.get('type')}")
+                self._store(unit_id, reply["columns"], worker)
+                unit_id = None
+        except (OSError, ConnectionError, ValueError):
+            # Dead, hung or confused worker: hand its unit to someone else
+            if unit_id is not None and not self.finished.is_set():
+                with self.lock:
+                    self.retries += 1
+                self.pending.put(unit_id)
+        finally:
+            conn.close()
+
+    def _store(self, unit_id, columns, worker):
+        with self.lock:
+            if unit_id in self.results:
+                return  # A retried unit came back twice
+            self.results[unit_id] = columns
+            done = len(self.results) == len(self.units)
+        self.telemetry.update_many(len(columns["won"]), sum(columns["total_guesses"]),
+                                   sum(columns["won"]), worker)
+        if done:
+            self.finished.set()
+
+    def results_table(self):
+        frames = [pd.DataFrame(self.results[unit_id]) for unit_id in range(len(self.units))]
+        if not frames:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.concat(frames, ignore_index=True)[RESULT_COLUMNS]
+
+
+# --- Worker ---
+def run_worker(host, port, crash_after=None, connect_timeout=30):
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.2)
+
+    with sock:
+        send_message(sock, {"type": "hello", "pid": os.getpid(), "host": socket.gethostname()})
+        config = recv_message(sock)
+        # Vocabulary is loaded once per worker, not per work unit
+        words, frequencies, play = load_strategy(config["strategy"], config.get("vocab_dir"))
+        units_done = 0
+        while True:
+            message = recv_message(sock)
+            if message["type"] == "done":
+                return units_done
+            if crash_after is not None and units_done >= crash_after:
+                os._exit(1)  # Simulated worker death, used to exercise retries
+            columns = play_range(play, words, frequencies, config["seed"],
+                                 message["start"], message["count"])
+            send_message(sock, {"type": "result", "unit": message["unit"], "columns": columns})
+            units_done += 1
+
+
+# --- Localhost cluster: coordinator in-process plus worker subprocesses ---
+def run_localhost_cluster(strategy, num_games, workers=4, unit_size=500, seed=0, crash_after=None,
+                          vocab_dir=None, max_restarts=None):
+    # Workers that die are restarted, up to max_restarts in total (default:
+    # one per worker). Once every worker is gone the run fails with RuntimeError.
+    coordinator = Coordinator(strategy, num_games, unit_size, seed, port=0, vocab_dir=vocab_dir)
+    max_restarts = workers if max_restarts is None else max_restarts
+    restarts = 0
+
+    def spawn(crash=False):
+        command = [sys.executable, os.path.abspath(__file__), 'worker',
+                   '--host', '127.0.0.1', '--port', str(coordinator.port)]
+        if crash:
+            command += ['--crash-after', str(crash_after)]
+        return subprocess.Popen(command)
+
+    def check_workers():
+        nonlocal restarts
+        for i, process in enumerate(processes):
+            if process.poll() not in (None, 0) and restarts < max_restarts:
+                processes[i] = spawn()
+                restarts += 1
+        if all(process.poll() is not None for process in processes):
+            raise RuntimeError(f"All {workers} worker process(es) exited before the run finished "
+                               f"({restarts} restart(s))")
+
+    processes = [spawn(crash_after is not None and i == 0) for i in range(workers)]
+    try:
+        df = coordinator.serve(check_workers)
+    finally:
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    return df, coordinator.retries
+
+
+def report(df, strategy):
+    print("Batch run complete.")
+    print(f"Total wins: {df['won'].sum()} out of " + str(len(df)) + " games.")
+    print(f"Win rate: {df['won'].mean():.4f}")
+    df.to_csv(RESULT_FILES[strategy], index=False)
+    print("Results saved to " + RESULT_FILES[strategy])
+    run_id = write_run(df, strategy)
+    print(f"Run stored as results_store/strategy={strategy}/run=" + run_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spread hangman batch runs across hosts.")
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    coordinator_args = sub.add_parser('coordinator', help="Hand out work units and merge results")
+    coordinator_args.add_argument('--bind', default='0.0.0.0')
+    coordinator_args.add_argument('--port', type=int, default=5555)
+
+    worker_args = sub.add_parser('worker', help="Play work units for a coordinator")
+    worker_args.add_argument('--host', default='127.0.0.1')
+    worker_args.add_argument('--port', type=int, default=5555)
+    worker_args.add_argument('--crash-after', type=int, default=None, help=argparse.SUPPRESS)
+
+    local_args = sub.add_parser('local', help="Coordinator plus worker processes on this machine")
+    local_args.add_argument('--workers', type=int, default=4)
+    local_args.add_argument('--crash-after', type=int, default=None,
+                            help="Kill the first worker after this many units to test retries")
+
+    for p in (coordinator_args, local_args):
+        p.add_argument('--strategy', choices=['bot', 'ai'], default='bot')
+        p.add_argument('--games', type=int, default=50000)
+        p.add_argument('--unit-size', type=int, default=500)
+        p.add_argument('--seed', type=int, default=0)
+        p.add_argument('--vocab-dir', default=None,
+                       help="Play from a sharded_vocab.py build instead of unigram_freq.csv")
+
+    args = parser.parse_args()
+    if args.mode == 'worker':
+        run_worker(args.host, args.port, args.crash_after)
+    elif args.mode == 'coordinator':
+        coordinator = Coordinator(args.strategy, args.games, args.unit_size, args.seed,
+                                  args.bind, args.port, vocab_dir=args.vocab_dir)
+        print(f"Coordinator listening on {args.bind}:{coordinator.port} "
+              f"({len(coordinator.units)} work units)")
+        df = coordinator.serve()
+        report(df, args.strategy)
+    else:
+        print(f"Running {args.games} games on {args.workers} local workers...")
+        df, retries = run_localhost_cluster(args.strategy, args.games, args.workers,
+                                            args.unit_size, args.seed, args.crash_after,
+                                            args.vocab_dir)
+        if retries:
+            print(f"Retried {retries} work unit(s) from dead workers.")
+        report(df, args.strategy)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+import random
+import time
+import numpy as np
+import pandas as pd
+from sharded_vocab import ShardedVocab, shards_from_words, vocab_dir_from_env
+from hangman_telemetry import BatchTelemetry, metrics_port_from_env
+from results_store import write_run
+
+MAX_ATTEMPTS = 6
+
+
+# --- Adversarial host ---
+class EvilHost:
+    # policy='largest' keeps the family with the most words,
+    # policy='weight' keeps the family with the highest total word weight.
+    def __init__(self, words, frequencies, policy='largest', shards=None):
+        if policy not in ('largest', 'weight'):
+            raise ValueError(f"Unknown policy: {policy}")
+        self.policy = policy
+        self.shards = shards_from_words(words, frequencies) if shards is None else shards
+
+    def new_game(self, length):
+        return EvilGame(self, length)
+
+
+class EvilGame:
+    def __init__(self, host, length):
+        self.host = host
+        self.shard = host.shards.get(length)
+        self.codes, self.weights = self.shard.codes, self.shard.weights
+        self.length = length
+        self.candidates = np.arange(len(self.shard))
+        self.word_completion = "_" * length
+        # Position bit values used to turn a reveal pattern into one integer key
+        self.position_bits = np.left_shift(np.int64(1), np.arange(length, dtype=np.int64))
+
+    def apply_guess(self, letter):
+        hits = self.codes[self.candidates] == ord(letter)
+        keys = hits.astype(np.int64) @ self.position_bits
+        weights = self.weights[self.candidates] if self.host.policy == 'weight' else None
+
+        if self.length <= 16:
+            # Direct indexed counting: one slot per possible reveal pattern
+            family_sizes = np.bincount(keys, weights=weights, minlength=1)
+            best_key = int(np.argmax(family_sizes))
+        else:
+            family_keys, inverse = np.unique(keys, return_inverse=True)
+            family_sizes = np.bincount(inverse, weights=weights)
+            best_key = int(family_keys[np.argmax(family_sizes)])
+        # Ties resolve to the lowest key, so a miss (key 0) wins any tie
+
+        self.candidates = self.candidates[keys == best_key]
+        if best_key == 0:
+            return False
+        self.word_completion = "".join(
+            letter if best_key >> i & 1 else c for i, c in enumerate(self.word_completion)
+        )
+        return True
+
+    def commit_word(self):
+        # Only called once the game is over: settle on the heaviest survivor
+        best = self.candidates[np.argmax(self.weights[self.candidates])]
+        return self.shard.word(best)
+
+
+# --- Game loop against a guessing strategy ---
+def play_evil_game(host, length, guesser):
+    game = host.new_game(length)
+    guessed_letters = []
+    attempts_remaining = MAX_ATTEMPTS
+
+    while attempts_remaining > 0 and "_" in game.word_completion:
+        guess = guesser(game.word_completion, guessed_letters, attempts_remaining)
+        if not guess or guess in guessed_letters:
+            break  # Strategy has nothing left to try
+        guessed_letters.append(guess)
+        guessed_letters.sort()
+        if not game.apply_guess(guess):
+            attempts_remaining -= 1
+
+    word = game.commit_word()
+    return {
+        "word": word,
+        "won": int("_" not in game.word_completion),
+        "word_length": length,
+        "attempts_used": MAX_ATTEMPTS - attempts_remaining,
+        "total_guesses": len(guessed_letters)
+    }
+
+
+# --- Strategies from the existing game modules ---
+def make_bot_guesser(words, frequencies, shards=None):
+    import Hangman
+
+    if shards is None:
+        shards = shards_from_words(words, frequencies)
+
+    def guesser(word_completion, guessed_letters, attempts_remaining):
+        guess = None
+        if attempts_remaining <= 2:
+            guess = Hangman.get_best_letter_from_likely_word(
+                word_completion, guessed_letters, shards
+            )
+        return guess or Hangman.get_bot_guess(guessed_letters)
+
+    return guesser
+
+
+def make_ai_guesser(words, frequencies, shards=None):
+    import aihangman_py  # Needs torch for the length distributions
+
+    if words is None:
+        # Sharded vocabulary: score letters straight from the shard
+        def guesser(word_completion, guessed_letters, attempts_remaining):
+            return aihangman_py.get_ai_guess_from_shard(
+                shards.get(len(word_completion)), word_completion, guessed_letters
+            )
+
+        return guesser
+
+    ai_dist = aihangman_py.train_ai_by_word_length(words)
+
+    def guesser(word_completion, guessed_letters, attempts_remaining):
+        return aihangman_py.get_ai_guess_from_distribution(
+            ai_dist, word_completion, guessed_letters, words, frequencies
+        )
+
+    return guesser
+
+
+STRATEGIES = {'bot': make_bot_guesser, 'ai': make_ai_guesser}
+
+
+def run_evil_batch(strategy, num_games, words, frequencies, policy='largest', metrics_file=None,
+                   vocab=None):
+    # Pass words=None and a ShardedVocab as vocab to play from an on-disk vocabulary
+    host = EvilHost(words, frequencies, policy, shards=vocab)
+    guesser = STRATEGIES[strategy](words, frequencies, host.shards)
+    # Word lengths follow the same weighted draw the normal host uses
+    if vocab is not None:
+        lengths = [vocab.sample_length() for _ in range(num_games)]
+    else:
+        lengths = [len(w) for w in random.choices(words, weights=frequencies, k=num_games)]
+
+    results = []
+    telemetry = BatchTelemetry(num_games, metrics_file=metrics_file, http_port=metrics_port_from_env())
+    with telemetry:
+        for length in lengths:
+            game_data = play_evil_game(host, length, guesser)
+            results.append(game_data)
+            telemetry.update(game_data)
+    return pd.DataFrame(results)
+
+
+# --- Entry point ---
+def play_evil_batch():
+    from Hangman import load_words
+
+    vocab_dir = vocab_dir_from_env()
+    vocab = ShardedVocab(vocab_dir) if vocab_dir else None
+    words, frequencies = (None, None) if vocab is not None else load_words()
+
+    print("Evil Hangman: the host never commits to a word until it has to.")
+    time.sleep(1.5)
+    print("Choose the strategy to stress test:")
+    print("1. Bot (Hangman.py)")
+    print("2. AI (aihangman_py.py)")
+    strategy_input = input("Enter 1 or 2: ")
+    while strategy_input not in ['1', '2']:
+        print("Invalid input. Please enter 1 or 2.")
+        strategy_input = input("Enter 1 or 2: ")
+    strategy = {'1': 'bot', '2': 'ai'}[strategy_input]
+
+    policy_input = input("Keep the largest family (1) or the heaviest family (2)? ")
+    policy = 'weight' if policy_input == '2' else 'largest'
+
+    num_games = int(input("Enter the number of games to run (default is 50,000): ") or 50000)
+    while num_games <= 0:
+        print("Invalid input. Please enter a positive number.")
+        num_games = int(input("Enter the number of games to run (default is 50,000): ") or 50000)
+
+    filename = f"hangman_evil_{strategy}_batch_results.csv"
+    print("Running " + str(num_games) + " evil games...")
+    df = run_evil_batch(strategy, num_games, words, frequencies, policy,
+                        metrics_file=f"hangman_evil_{strategy}_batch_metrics.jsonl", vocab=vocab)
+
+    print("Batch run complete.")
+    print(f"Total wins: {df['won'].sum()} out of " + str(num_games) + " games.")
+    print(f"Win rate: {df['won'].mean():.4f}")
+    df.to_csv(filename, index=False)
+    print("Results saved to " + filename)
+    run_id = write_run(df, f"evil_{strategy}")
+    print(f"Run stored as results_store/strategy=evil_{strategy}/run=" + run_id)
+
+
+if __name__ == '__main__':
+    play_evil_batch()
@@ -0,0 +1,112 @@
+from typing import NamedTuple
+
+MAX_ATTEMPTS = 6
+
+# Outcomes of apply_guess
+HIT = 'hit'
+MISS = 'miss'
+REPEAT = 'repeat'
+INVALID = 'invalid'
+
+
+# --- Immutable game state ---
+class GameState(NamedTuple):
+    word: str
+    word_completion: str
+    guessed_letters: tuple  # Kept sorted, like the guessed_letters lists in the game modules
+    attempts_remaining: int
+    max_attempts: int = MAX_ATTEMPTS
+
+    @property
+    def won(self):
+        return "_" not in self.word_completion
+
+    @property
+    def over(self):
+        return self.won or self.attempts_remaining <= 0
+
+
+def new_game(word, max_attempts=MAX_ATTEMPTS):
+    return GameState(word, "_" * len(word), (), max_attempts, max_attempts)
+
+
+# --- Rules ---
+def apply_guess(state, letter):
+    # Pure transition: returns (new_state, outcome) and never touches I/O
+    if state.over or not letter or len(letter) != 1 or not letter.isalpha():
+        return state, INVALID
+    if letter in state.guessed_letters:
+        return state, REPEAT
+
+    guessed_letters = tuple(sorted(state.guessed_letters + (letter,)))
+    if letter in state.word:
+        word_completion = "".join(
+            c if c == letter else wc for c, wc in zip(state.word, state.word_completion)
+        )
+        return state._replace(word_completion=word_completion, guessed_letters=guessed_letters), HIT
+    return state._replace(guessed_letters=guessed_letters,
+                          attempts_remaining=state.attempts_remaining - 1), MISS
+
+
+def game_result(state, won=None):
+    # Same row the batch CSVs use
+    return {
+        "word": state.word,
+        "won": int(state.won) if won is None else won,
+        "word_length": len(state.word),
+        "attempts_used": state.max_attempts - state.attempts_remaining,
+        "total_guesses": len(state.guessed_letters)
+    }
+
+
+class HangmanGame:
+    def __init__(self, word, max_attempts=MAX_ATTEMPTS):
+        self.state = new_game(word, max_attempts)
+
+    def apply_guess(self, letter):
+        self.state, outcome = apply_guess(self.state, letter)
+        return outcome
+
+    @property
+    def over(self):
+        return self.state.over
+
+    def result(self):
+        return game_result(self.state)
+
+
+# --- Driving many games from one thread ---
+def game_coroutine(word, max_attempts=MAX_ATTEMPTS):
+    # Yields the current state and receives the next letter via send();
+    # the game's result row is the StopIteration value
+    state = new_game(word, max_attempts)
+    while not state.over:
+        letter = yield state
+        state, outcome = apply_guess(state, letter)
+        if outcome in (INVALID, REPEAT):
+            break  # A bot with nothing new to guess
+    return game_result(state)
+
+
+def run_interleaved(words, choose_guesses):
+    # Steps every unfinished game once per round. choose_guesses receives the
+    # list of current states and returns one letter per state, so a batched
+    # solver answers all of them in a single call, e.g.
+    #   run_interleaved(words, lambda states: solver.guess_batch(
+    #       [(s.word_completion, s.guessed_letters) for s in states]))
+    results = [None] * len(words)
+    active = []
+    for i, word in enumerate(words):
+        game = game_coroutine(word)
+        active.append((i, game, next(game)))
+
+    while active:
+        letters = choose_guesses([state for _, _, state in active])
+        still_active = []
+        for (i, game, _), letter in zip(active, letters):
+            try:
+                still_active.append((i, game, game.send(letter)))
+            except StopIteration as done:
+                results[i] = done.value
+        active = still_active
+    return results
@@ -0,0 +1,158 @@
+import numpy as np
+from sharded_vocab import shards_from_words
+
+# Upper bound on states x words evaluated at once, to cap temporary memory
+MAX_CELLS_PER_CHUNK = 1 << 22
+
+
+# --- Per-length alphabet indices over a VocabShard ---
+class _SolverBucket:
+    def __init__(self, shard):
+        self.shard = shard
+        codes = np.asarray(shard.codes)
+        self.weights = np.asarray(shard.weights)
+        self.alphabet = [chr(c) for c in np.unique(codes)]
+        self.letter_index = {letter: i for i, letter in enumerate(self.alphabet)}
+        # Letters as small alphabet indices, plus a words x letters presence matrix
+        self.index = np.searchsorted(np.unique(codes), codes).astype(np.int16)
+        self.presence = np.zeros((len(shard), len(self.alphabet)), dtype=np.float64)
+        rows = np.repeat(np.arange(len(shard)), codes.shape[1])
+        self.presence[rows, self.index.ravel()] = 1.0
+        # Fallback when nothing matches, normalized like train_ai_by_word_length
+        counts = self.presence.sum(axis=0)
+        self.distribution = counts / counts.sum()
+
+
+# --- Batched solver ---
+class HangmanSolver:
+    # Built once from the vocabulary. guess_batch() answers many
+    # (word_completion, guessed_letters) states at once using the same
+    # rule as get_ai_guess_from_distribution: sum the weights of every
+    # consistent word containing each unguessed letter and take the best,
+    # falling back to the length distribution when nothing matches.
+    # Ties go to the alphabetically first letter.
+    # shards may be a {length: VocabShard} dict or a ShardedVocab; a length's
+    # indices are only built the first time a state of that length is seen.
+    def __init__(self, words=None, frequencies=None, shards=None):
+        self.shards = shards_from_words(words, frequencies) if shards is None else shards
+        self.buckets = {}
+
+    def _bucket(self, length):
+        if length not in self.buckets:
+            shard = self.shards.get(length)
+            self.buckets[length] = None if shard is None else _SolverBucket(shard)
+        return self.buckets[length]
+
+    def _encode_states(self, bucket, states):
+        length = len(states[0][0])
+        required = np.full((len(states), length), -1, dtype=np.int32)
+        guessed = np.zeros((len(states), len(bucket.alphabet)), dtype=bool)
+        for b, (word_completion, guessed_letters) in enumerate(states):
+            for p, c in enumerate(word_completion):
+                if c != '_':
+                    # Letters outside this bucket's alphabet can never match
+                    required[b, p] = bucket.letter_index.get(c, -2)
+            for c in guessed_letters:
+                i = bucket.letter_index.get(c)
+                if i is not None:
+                    guessed[b, i] = True
+        return required, guessed
+
+    def _match(self, bucket, required, guessed):
+        mask = np.ones((len(required), len(bucket.weights)), dtype=bool)
+        for p in range(required.shape[1]):
+            column = bucket.index[:, p]
+            # -2 (a letter outside the alphabet) counts as revealed and equals no column value
+            revealed = required[:, p, None] != -1
+            same = column[None, :] == required[:, p, None]
+            # Blank positions may not hold a letter that was already guessed
+            not_guessed = ~guessed[:, column]
+            mask &= np.where(revealed, same, not_guessed)
+        return mask
+
+    def candidate_indices(self, word_completion, guessed_letters):
+        bucket = self._bucket(len(word_completion))
+        if bucket is None:
+            return np.zeros(0, dtype=np.int64)
+        required, guessed = self._encode_states(bucket, [(word_completion, guessed_letters)])
+        return np.flatnonzero(self._match(bucket, required, guessed)[0])
+
+    def candidates(self, word_completion, guessed_letters):
+        bucket = self._bucket(len(word_completion))
+        return [bucket.shard.word(i) for i in self.candidate_indices(word_completion, guessed_letters)]
+
+    def reveal_families(self, word_completion, guessed_letters, letter):
+        # Every way the host can answer `letter`, as (word_completion after the
+        # guess, total weight, word count), heaviest first. A miss leaves
+        # word_completion unchanged.
+        bucket = self._bucket(len(word_completion))
+        indices = self.candidate_indices(word_completion, guessed_letters)
+        if len(indices) == 0:
+            return []
+        weights = bucket.weights[indices]
+        letter_index = bucket.letter_index.get(letter)
+        if letter_index is None:
+            return [(word_completion, float(weights.sum()), len(indices))]
+
+        position_bits = np.left_shift(np.int64(1), np.arange(len(word_completion), dtype=np.int64))
+        keys = (bucket.index[indices] == letter_index).astype(np.int64) @ position_bits
+        family_keys, inverse = np.unique(keys, return_inverse=True)
+        family_weights = np.bincount(inverse, weights=weights)
+        family_counts = np.bincount(inverse)
+
+        families = []
+        for f in np.argsort(-family_weights, kind='stable'):
+            key = int(family_keys[f])
+            revealed = "".join(letter if key >> i & 1 else c for i, c in enumerate(word_completion))
+            families.append((revealed, float(family_weights[f]), int(family_counts[f])))
+        return families
+
+    def guess(self, word_completion, guessed_letters):
+        return self.guess_batch([(word_completion, guessed_letters)])[0]
+
+    def guess_batch(self, states, return_scores=False):
+        guesses = [None] * len(states)
+        scores = [None] * len(states)
+
+        # Group states by word length so each group is one vectorized pass
+        groups = {}
+        for i, (word_completion, _) in enumerate(states):
+            groups.setdefault(len(word_completion), []).append(i)
+
+        for length, positions in groups.items():
+            bucket = self._bucket(length)
+            if bucket is None:
+                for i in positions:
+                    guesses[i], scores[i] = self._uniform_guess(states[i][1], return_scores)
+                continue
+
+            chunk_size = max(1, MAX_CELLS_PER_CHUNK // len(bucket.weights))
+            for start in range(0, len(positions), chunk_size):
+                chunk = positions[start:start + chunk_size]
+                required, guessed = self._encode_states(bucket, [states[i] for i in chunk])
+                mask = self._match(bucket, required, guessed)
+                letter_scores = (mask * bucket.weights) @ bucket.presence
+                has_candidates = mask.any(axis=1)
+                # Only letters present in some candidate count, as in the scalar guesser
+                available = ((mask.astype(np.float64) @ bucket.presence) > 0) & ~guessed
+                letter_scores = np.where(has_candidates[:, None], letter_scores, bucket.distribution)
+                available = np.where(has_candidates[:, None], available, ~guessed)
+
+                ranked = np.where(available, letter_scores, -np.inf)
+                best = ranked.argmax(axis=1)
+                for row, i in enumerate(chunk):
+                    if available[row].any():
+                        guesses[i] = bucket.alphabet[best[row]]
+                    if return_scores:
+                        scores[i] = {bucket.alphabet[a]: float(letter_scores[row, a])
+                                     for a in np.flatnonzero(available[row])}
+
+        if return_scores:
+            return guesses, scores
+        return guesses
+
+    def _uniform_guess(self, guessed_letters, return_scores):
+        # No words of this length at all: every unguessed letter scores 1/26
+        unguessed = [chr(i + ord('a')) for i in range(26) if chr(i + ord('a')) not in guessed_letters]
+        guess = unguessed[0] if unguessed else None
+        return guess, ({letter: 1 / 26 for letter in unguessed} if return_scores else None)
@@ -0,0 +1,203 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# --- Process memory ---
+def current_memory_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource  # Unix only
+    except ImportError:
+        return float('nan')
+    # Peak RSS: kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+# --- Batch telemetry ---
+class BatchTelemetry:
+    # The batch loop only bumps per-worker counters in update(); all rate,
+    # ETA and memory calculations happen on a reporter thread every interval.
+    def __init__(self, total_games, interval=1.0, metrics_file=None, http_port=None,
+                 workers=1, stream=sys.stdout):
+        self.total_games = total_games
+        self.interval = interval
+        self.metrics_file = metrics_file
+        self.http_port = http_port
+        self.stream = stream
+        self.games = [0] * workers
+        self.guesses = [0] * workers
+        self.wins = [0] * workers
+        self.start_time = None
+        self.last_snapshot = None
+        self.latest = {}
+        self._lock = threading.Lock()  # For updates arriving from several threads
+        self._stop = threading.Event()
+        self._reporter = None
+        self._server = None
+
+    def update(self, game_data, worker=0):
+        self.games[worker] += 1
+        self.guesses[worker] += game_data["total_guesses"]
+        self.wins[worker] += game_data["won"]
+
+    def update_many(self, games, guesses, wins, worker=0):
+        # Safe to call from several threads, unlike update() on the batch loop
+        with self._lock:
+            self.games[worker] += games
+            self.guesses[worker] += guesses
+            self.wins[worker] += wins
+
+    def add_worker(self):
+        # Workers that join mid-run (e.g. remote batch workers) get a new slot
+        with self._lock:
+            self.guesses.append(0)
+            self.wins.append(0)
+            self.games.append(0)
+            return len(self.games) - 1
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.last_snapshot = (self.start_time, 0, 0, [0] * len(self.games))
+        if self.metrics_file:
+            open(self.metrics_file, 'w').close()
+        if self.http_port is not None:
+            self._start_http_server()
+        self._reporter = threading.Thread(target=self._run, daemon=True)
+        self._reporter.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._reporter is not None:
+            self._reporter.join()
+        self._report()
+        self.stream.write("\n")
+        self.stream.flush()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._report()
+
+    # --- Snapshot and sinks ---
+    def snapshot(self):
+        now = time.perf_counter()
+        with self._lock:
+            worker_games = list(self.games)
+            guesses = sum(self.guesses)
+            wins = sum(self.wins)
+        games = sum(worker_games)
+        last_time, last_games, last_guesses, last_worker_games = self.last_snapshot
+        last_worker_games = last_worker_games + [0] * (len(worker_games) - len(last_worker_games))
+        window = max(now - last_time, 1e-9)
+        elapsed = max(now - self.start_time, 1e-9)
+
+        avg_rate = games / elapsed
+        remaining = self.total_games - games
+        self.last_snapshot = (now, games, guesses, worker_games)
+        return {
+            "timestamp": time.time(),
+            "elapsed_s": elapsed,
+            "games": games,
+            "total_games": self.total_games,
+            "progress": games / self.total_games if self.total_games else 1.0,
+            "games_per_s": (games - last_games) / window,
+            "guesses_per_s": (guesses - last_guesses) / window,
+            "avg_games_per_s": avg_rate,
+            "eta_s": remaining / avg_rate if avg_rate > 0 else None,
+            "win_rate": wins / games if games else 0.0,
+            "memory_mb": current_memory_mb(),
+            "workers": [
+                {"worker": w, "games": g, "games_per_s": (g - last) / window}
+                for w, (g, last) in enumerate(zip(worker_games, last_worker_games))
+            ],
+        }
+
+    def _report(self):
+        metrics = self.snapshot()
+        self.latest = metrics
+        line = (f"\rProgress: {metrics['progress'] * 100:.1f}% | "
+                f"{metrics['games_per_s']:.0f} games/s | "
+                f"{metrics['guesses_per_s']:.0f} guesses/s | "
+                f"ETA {format_eta(metrics['eta_s'])} | "
+                f"win rate {metrics['win_rate']:.4f} | "
+                f"{metrics['memory_mb']:.0f} MB")
+        if len(metrics['workers']) > 1:
+            line += " | " + " ".join(f"w{w['worker']}:{w['games_per_s']:.0f}/s"
+                                     for w in metrics['workers'])
+        self.stream.write(line)
+        self.stream.flush()
+        if self.metrics_file:
+            with open(self.metrics_file, 'a') as f:
+                f.write(json.dumps(metrics) + "\n")
+
+    def prometheus_text(self):
+        metrics = self.latest
+        if not metrics:
+            return ""
+        lines = []
+        for key in ("games", "total_games", "progress", "games_per_s", "guesses_per_s",
+                    "avg_games_per_s", "win_rate", "memory_mb", "elapsed_s"):
+            lines.append(f"hangman_batch_{key} {metrics[key]}")
+        if metrics["eta_s"] is not None:
+            lines.append(f"hangman_batch_eta_s {metrics['eta_s']}")
+        for w in metrics["workers"]:
+            lines.append(f'hangman_batch_worker_games{{worker="{w["worker"]}"}} {w["games"]}')
+            lines.append(f'hangman_batch_worker_games_per_s{{worker="{w["worker"]}"}} {w["games_per_s"]}')
+        return "\n".join(lines) + "\n"
+
+    def _start_http_server(self):
+        telemetry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body = telemetry.prometheus_text().encode()
+                    content_type = 'text/plain; version=0.0.4'
+                elif self.path in ('/', '/metrics.json'):
+                    body = json.dumps(telemetry.latest).encode()
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep the progress line clean
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.http_port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+
+def metrics_port_from_env():
+    port = os.environ.get('HANGMAN_METRICS_PORT')
+    return int(port) if port else None
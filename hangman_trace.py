@@ -0,0 +1,214 @@
+import json
+import os
+import queue
+import sys
+import threading
+import numpy as np
+
+# --- Trace record layouts ---
+# One row per accepted guess, one row per finished game. Both tables are
+# stored column by column so the replay tool only reads what it needs.
+GUESS_DTYPE = np.dtype([
+    ('game_id', '<u4'),
+    ('step', '<u2'),
+    ('letter', '<U1'),
+    ('hit', 'u1'),
+    ('candidates', '<i4'),   # -1 when the strategy did not scan candidates
+    ('latency_us', '<f4'),
+])
+
+MAX_WORD_LENGTH = 32
+
+
+def game_dtype(max_word_length=MAX_WORD_LENGTH):
+    # The word column is fixed width, sized from the vocabulary's longest word
+    return np.dtype([
+        ('game_id', '<u4'),
+        ('word', f'<U{max_word_length}'),
+        ('won', 'u1'),
+    ])
+
+
+
+# --- Preallocated ring buffer for one table ---
+class _RingTable:
+    def __init__(self, name, dtype, directory, capacity, segments, pending):
+        self.name = name
+        self.dtype = dtype
+        self.directory = os.path.join(directory, name)
+        self.segment_size = max(1, capacity // segments)
+        self.buffer = np.zeros(self.segment_size * segments, dtype=dtype)
+        self.segments = segments
+        self.pending = pending
+        self.free = [threading.Event() for _ in range(segments)]
+        for event in self.free:
+            event.set()
+        self.pos = 0
+        self.segment_start = 0
+        self.rows = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        for field in dtype.names:
+            # Truncate any columns left over from a previous run
+            open(self._column_path(field), 'wb').close()
+
+    def _column_path(self, field):
+        return os.path.join(self.directory, field + '.bin')
+
+    def append(self, row):
+        if self.pos == self.segment_start:
+            # Entering a new segment: wait until the writer has drained it
+            segment = self.pos // self.segment_size
+            self.free[segment].wait()
+            self.free[segment].clear()
+        self.buffer[self.pos] = row
+        self.pos += 1
+        self.rows += 1
+        if self.pos - self.segment_start == self.segment_size:
+            self._hand_off()
+
+    def _hand_off(self):
+        start, end = self.segment_start, self.pos
+        if end > start:
+            self.pending.put((self, start, end))
+        self.pos = end % len(self.buffer)
+        self.segment_start = self.pos
+
+    def write_segment(self, start, end):
+        chunk = self.buffer[start:end]
+        for field in self.dtype.names:
+            with open(self._column_path(field), 'ab') as f:
+                f.write(np.ascontiguousarray(chunk[field]).tobytes())
+        self.free[start // self.segment_size].set()
+
+
+# --- Trace recorder used by the batch runners ---
+class TraceRecorder:
+    # count_candidates asks strategies that do not scan candidates anyway
+    # (the bot) to count them for the trace; that costs an extra scan per guess.
+    def __init__(self, directory, capacity=1 << 16, segments=4, count_candidates=False,
+                 max_word_length=MAX_WORD_LENGTH):
+        self.directory = directory
+        self.count_candidates = count_candidates
+        self.max_word_length = max_word_length
+        self.pending = queue.Queue()
+        tables = {'guesses': GUESS_DTYPE, 'games': game_dtype(max_word_length)}
+        self.tables = {
+            name: _RingTable(name, dtype, directory, capacity, segments, self.pending)
+            for name, dtype in tables.items()
+        }
+        self._guesses = self.tables['guesses']
+        self._games = self.tables['games']
+        self._writer = threading.Thread(target=self._drain, daemon=True)
+        self._writer.start()
+        self.closed = False
+
+    def _drain(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            table, start, end = item
+            table.write_segment(start, end)
+
+    def record_guess(self, game_id, step, letter, hit, candidates, latency_us):
+        self._guesses.append((game_id, step, letter, hit, candidates, latency_us))
+
+    def record_game(self, game_id, word, won):
+        if len(word) > self.max_word_length:
+            # numpy would silently cut the word short
+            raise ValueError(f"Word of length {len(word)} does not fit the trace "
+                             f"(max_word_length={self.max_word_length})")
+        self._games.append((game_id, word, won))
+
+    def close(self):
+        if self.closed:
+            return
+        for table in self.tables.values():
+            table._hand_off()
+        self.pending.put(None)
+        self._writer.join()
+        meta = {
+            name: {
+                'rows': table.rows,
+                'columns': {field: table.dtype[field].str for field in table.dtype.names},
+            }
+            for name, table in self.tables.items()
+        }
+        with open(os.path.join(self.directory, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Reading traces back ---
+def load_trace_columns(directory, table, columns=None):
+    with open(os.path.join(directory, 'meta.json')) as f:
+        meta = json.load(f)[table]
+    columns = columns or list(meta['columns'])
+    result = {}
+    for field in columns:
+        path = os.path.join(directory, table, field + '.bin')
+        dtype = np.dtype(meta['columns'][field])
+        if meta['rows'] == 0:
+            result[field] = np.zeros(0, dtype=dtype)
+        else:
+            result[field] = np.memmap(path, dtype=dtype, mode='r', shape=(meta['rows'],))
+    return result
+
+
+def replay_game(directory, game_id):
+    games = load_trace_columns(directory, 'games')
+    game_rows = np.flatnonzero(games['game_id'] == game_id)
+    if len(game_rows) == 0:
+        return None
+    word = str(games['word'][game_rows[0]])
+    won = int(games['won'][game_rows[0]])
+
+    guesses = load_trace_columns(directory, 'guesses')
+    rows = np.flatnonzero(guesses['game_id'] == game_id)
+    rows = rows[np.argsort(guesses['step'][rows], kind='stable')]
+
+    guessed_letters = []
+    steps = []
+    for r in rows:
+        letter = str(guesses['letter'][r])
+        guessed_letters.append(letter)
+        steps.append({
+            "step": int(guesses['step'][r]),
+            "letter": letter,
+            "hit": int(guesses['hit'][r]),
+            "candidates": int(guesses['candidates'][r]),
+            "latency_us": float(guesses['latency_us'][r]),
+            "word_completion": "".join([c if c in guessed_letters else "_" for c in word]),
+        })
+
+    return {"game_id": game_id, "word": word, "won": won, "steps": steps}
+
+
+# --- Replay tool ---
+def print_replay(game):
+    print(f"Game {game['game_id']}: {game['word']} ({'won' if game['won'] else 'lost'})")
+    misses = 0
+    for step in game['steps']:
+        misses += 0 if step['hit'] else 1
+        candidates = step['candidates'] if step['candidates'] >= 0 else '-'
+        print(f"  {step['step']:>2}  '{step['letter']}'  {'hit ' if step['hit'] else 'miss'}  "
+              f"{step['word_completion']}  misses={misses}  candidates={candidates}  "
+              f"{step['latency_us']:.1f} us")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("Usage: python hangman_trace.py <trace_dir> <game_id>")
+        sys.exit(1)
+    game = replay_game(sys.argv[1], int(sys.argv[2]))
+    if game is None:
+        print(f"Game {sys.argv[2]} not found in {sys.argv[1]}")
+        sys.exit(1)
+    print_replay(game)
@@ -0,0 +1,191 @@
+import itertools
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+STORE_DIR = 'results_store'
+
+# Column layout of every stored run; same columns as the batch CSVs
+COLUMNS = {
+    "word": np.str_,
+    "won": np.uint8,
+    "word_length": np.uint16,
+    "attempts_used": np.uint8,
+    "total_guesses": np.uint8,
+}
+HISTOGRAMS = ("attempts_used", "total_guesses")
+SUMMARY_COLUMNS = ["strategy", "word_length", "games", "wins", "losses", "win_rate"]
+
+
+# --- Layout ---
+# <root>/strategy=<name>/summary.json             totals across every run
+# <root>/strategy=<name>/run=<run_id>/<col>.npy   one file per column
+# <root>/strategy=<name>/run=<run_id>/summary.json
+def strategy_dir(root, strategy):
+    return os.path.join(root, f'strategy={strategy}')
+
+
+def run_dir(root, strategy, run_id):
+    return os.path.join(strategy_dir(root, strategy), f'run={run_id}')
+
+
+def list_strategies(root=STORE_DIR):
+    if not os.path.isdir(root):
+        return []
+    return sorted(name.split('=', 1)[1] for name in os.listdir(root) if name.startswith('strategy='))
+
+
+def list_runs(root, strategy):
+    path = strategy_dir(root, strategy)
+    if not os.path.isdir(path):
+        return []
+    return sorted(name.split('=', 1)[1] for name in os.listdir(path)
+                  if name.startswith('run=') and not name.endswith('.tmp'))
+
+
+# --- Summaries ---
+def summarize(df):
+    summary = {"games": int(len(df)), "wins": int(df["won"].sum()), "by_length": {}}
+    summary["win_rate"] = summary["wins"] / summary["games"] if summary["games"] else 0.0
+    for length, group in df.groupby("word_length"):
+        entry = {"games": int(len(group)), "wins": int(group["won"].sum())}
+        entry["win_rate"] = entry["wins"] / entry["games"]
+        for column in HISTOGRAMS:
+            entry[column] = {str(k): int(v) for k, v in sorted(Counter(group[column]).items())}
+        summary["by_length"][str(int(length))] = entry
+    return summary
+
+
+def merge_summaries(total, summary):
+    total["games"] += summary["games"]
+    total["wins"] += summary["wins"]
+    total["win_rate"] = total["wins"] / total["games"] if total["games"] else 0.0
+    for length, entry in summary["by_length"].items():
+        merged = total["by_length"].setdefault(
+            length, {"games": 0, "wins": 0, **{column: {} for column in HISTOGRAMS}}
+        )
+        merged["games"] += entry["games"]
+        merged["wins"] += entry["wins"]
+        merged["win_rate"] = merged["wins"] / merged["games"]
+        for column in HISTOGRAMS:
+            for value, count in entry[column].items():
+                merged[column][value] = merged[column].get(value, 0) + count
+    return total
+
+
+# --- Writing ---
+def write_run(df, strategy, root=STORE_DIR, run_id=None):
+    base = run_id = run_id or time.strftime('%Y%m%d-%H%M%S')
+    os.makedirs(strategy_dir(root, strategy), exist_ok=True)
+    for n in itertools.count(1):
+        final_dir = run_dir(root, strategy, run_id)
+        tmp_dir = final_dir + '.tmp'
+        try:
+            os.mkdir(tmp_dir)  # Atomic, so concurrent writers never share a run_id
+        except FileExistsError:
+            pass
+        else:
+            if not os.path.exists(final_dir):
+                break
+            os.rmdir(tmp_dir)
+        # Never overwrite an earlier run; zero-padded so ids sort in creation order
+        run_id = f"{base}_{n:03d}"
+
+    for column, dtype in COLUMNS.items():
+        np.save(os.path.join(tmp_dir, column + '.npy'), df[column].to_numpy().astype(dtype))
+
+    summary = summarize(df)
+    summary.update({"strategy": strategy, "run_id": run_id})
+    with open(os.path.join(tmp_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.rename(tmp_dir, final_dir)  # Readers never see a half-written run
+
+    rebuild_summary(strategy, root)
+    return run_id
+
+
+def import_csv(path, strategy, root=STORE_DIR):
+    # Batch CSVs written before the store existed. Lines that are not game
+    # rows (e.g. pasted win totals) are dropped, and words like "nan" stay words.
+    df = pd.read_csv(path, keep_default_na=False, dtype={"word": str})
+    numeric = df[list(COLUMNS)[1:]].apply(pd.to_numeric, errors='coerce')
+    rows = numeric.notna().all(axis=1)
+    df = pd.concat([df.loc[rows, ["word"]], numeric[rows].astype(np.int64)], axis=1)
+    return write_run(df, strategy, root)
+
+
+def rebuild_summary(strategy, root=STORE_DIR):
+    # The strategy-wide summary is only a cache of the per-run summaries, so
+    # it is rebuilt from them rather than updated in place: two writers racing
+    # can leave it one run behind, but never lose or double-count a run, and
+    # load_summary() notices a stale cache and rebuilds it.
+    total = {"strategy": strategy, "runs": [], "games": 0, "wins": 0, "by_length": {}}
+    for run_id in list_runs(root, strategy):
+        total["runs"].append(run_id)
+        merge_summaries(total, load_summary(strategy, root, run_id))
+
+    total_path = os.path.join(strategy_dir(root, strategy), 'summary.json')
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=strategy_dir(root, strategy))
+    with os.fdopen(fd, 'w') as f:
+        json.dump(total, f, indent=2)
+    os.replace(tmp_path, total_path)
+    return total
+
+
+# --- Report queries ---
+def load_summary(strategy, root=STORE_DIR, run_id=None):
+    path = strategy_dir(root, strategy) if run_id is None else run_dir(root, strategy, run_id)
+    try:
+        with open(os.path.join(path, 'summary.json')) as f:
+            summary = json.load(f)
+    except FileNotFoundError:
+        if run_id is not None:
+            raise
+        summary = None
+    if run_id is None and (summary is None or summary["runs"] != list_runs(root, strategy)):
+        summary = rebuild_summary(strategy, root)
+    return summary
+
+
+def summary_by_length(strategies=None, root=STORE_DIR, run_id=None):
+    rows = []
+    for strategy in strategies or list_strategies(root):
+        summary = load_summary(strategy, root, run_id)
+        for length, entry in summary["by_length"].items():
+            rows.append({
+                "strategy": strategy,
+                "word_length": int(length),
+                "games": entry["games"],
+                "wins": entry["wins"],
+                "losses": entry["games"] - entry["wins"],
+                "win_rate": entry["win_rate"],
+            })
+    if not rows:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS).sort_values(
+        ["strategy", "word_length"]).reset_index(drop=True)
+
+
+def histogram(strategy, column, root=STORE_DIR, run_id=None):
+    summary = load_summary(strategy, root, run_id)
+    counts = Counter()
+    for entry in summary["by_length"].values():
+        counts.update({int(k): v for k, v in entry[column].items()})
+    return pd.Series(dict(sorted(counts.items())), name=column)
+
+
+def load_columns(strategy, columns=None, root=STORE_DIR, run_ids=None):
+    columns = columns or list(COLUMNS)
+    frames = []
+    for run_id in run_ids or list_runs(root, strategy):
+        path = run_dir(root, strategy, run_id)
+        frames.append(pd.DataFrame({
+            column: np.load(os.path.join(path, column + '.npy'), mmap_mode='r')
+            for column in columns
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
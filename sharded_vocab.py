@@ -0,0 +1,293 @@
+import json
+import os
+import random
+import shutil
+import sys
+from collections import Counter
+import numpy as np
+
+MANIFEST = 'manifest.json'
+VOCAB_DIR_ENV = 'HANGMAN_VOCAB_DIR'
+FLUSH_EVERY = 100000
+SCAN_CHUNK = 1 << 20
+EARLY_EXIT_CHUNK = 256
+COUNT_CACHE_SIZE = 1 << 16
+
+
+# --- Same filtering and weighting as load_words() ---
+def checkWordContainsVowel(word):
+    vowels = {'a', 'e', 'i', 'o', 'u'}
+    return any(letter in vowels for letter in word.lower())
+
+
+def word_weight(i, raw_freq):
+    weight = raw_freq / 12711
+    if i < 30:
+        weight = i / 1000
+    elif i < 1000:
+        weight *= i / 1000
+    return weight
+
+
+# --- Building the on-disk format ---
+# <out_dir>/manifest.json          lengths, counts and total weights
+# <out_dir>/len_<L>/codes.npy      (n, L) uint32 code points, heaviest word first
+# <out_dir>/len_<L>/weights.npy    (n,) float64 weights in the same order
+# <out_dir>/len_<L>/cumweights.npy (n,) running weight total for sampling
+# <out_dir>/len_<L>/letters.json   per-letter share of words containing it
+def build_sharded_vocab(csv_path, out_dir, min_length=3, require_vowel=True):
+    spill_dir = os.path.join(out_dir, '_spill')
+    # Spill files are appended to, so leftovers from an interrupted build must go
+    shutil.rmtree(spill_dir, ignore_errors=True)
+    os.makedirs(spill_dir)
+    pending = {}
+
+    def flush():
+        for length, (codes, weights) in pending.items():
+            with open(os.path.join(spill_dir, f'{length}.codes'), 'ab') as f:
+                f.write("".join(codes).encode('utf-32-le'))
+            with open(os.path.join(spill_dir, f'{length}.weights'), 'ab') as f:
+                f.write(np.asarray(weights, dtype='<f8').tobytes())
+        pending.clear()
+
+    # Stream the CSV once, spilling each length to its own file
+    buffered = 0
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        next(f)  # Skip header
+        for i, line in enumerate(f):
+            parts = line.strip().split(',')
+            if len(parts) != 2:
+                continue
+            word, freq = parts
+            word = word.lower()
+            if not word.isalpha() or len(word) < min_length:
+                continue
+            if require_vowel and not checkWordContainsVowel(word):
+                continue
+            codes, weights = pending.setdefault(len(word), ([], []))
+            codes.append(word)
+            weights.append(word_weight(i, float(freq)))
+            buffered += 1
+            if buffered >= FLUSH_EVERY:
+                flush()
+                buffered = 0
+    flush()
+
+    # Finalize one shard at a time so memory is bounded by the largest shard
+    manifest = {"version": 1, "source": os.path.basename(csv_path), "lengths": {}}
+    for name in os.listdir(spill_dir):
+        if not name.endswith('.codes'):
+            continue
+        length = int(name.split('.')[0])
+        codes = np.fromfile(os.path.join(spill_dir, name), dtype='<u4').reshape(-1, length)
+        weights = np.fromfile(os.path.join(spill_dir, f'{length}.weights'), dtype='<f8')
+        order = np.argsort(-weights, kind='stable')  # Ties keep dictionary order
+        codes, weights = codes[order], weights[order]
+
+        shard_dir = os.path.join(out_dir, f'len_{length}')
+        os.makedirs(shard_dir, exist_ok=True)
+        np.save(os.path.join(shard_dir, 'codes.npy'), codes)
+        np.save(os.path.join(shard_dir, 'weights.npy'), weights)
+        np.save(os.path.join(shard_dir, 'cumweights.npy'), np.cumsum(weights))
+        with open(os.path.join(shard_dir, 'letters.json'), 'w', encoding='utf-8') as f:
+            json.dump(shard_letter_distribution(codes), f, ensure_ascii=False)
+
+        manifest["lengths"][str(length)] = {
+            "count": int(len(weights)),
+            "total_weight": float(weights.sum()),
+        }
+
+    shutil.rmtree(spill_dir)
+    with open(os.path.join(out_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def shard_letter_distribution(codes):
+    # Same normalization as train_ai_by_word_length: words containing each letter
+    ctr = Counter()
+    for start in range(0, len(codes), SCAN_CHUNK):
+        chunk = codes[start:start + SCAN_CHUNK]
+        for code in np.unique(chunk):
+            ctr[chr(code)] += int((chunk == code).any(axis=1).sum())
+    total = sum(ctr.values())
+    return {letter: cnt / total for letter, cnt in sorted(ctr.items())} if total else {}
+
+
+# --- One length shard: code points and weights, heaviest word first ---
+class VocabShard:
+    def __init__(self, length, codes, weights, cumweights=None, letter_distribution=None):
+        self.length = length
+        self.codes = codes
+        self.weights = weights
+        self.cumweights = np.cumsum(weights) if cumweights is None else cumweights
+        self._letter_distribution = letter_distribution
+        self._counts = {}
+
+    def __len__(self):
+        return len(self.weights)
+
+    @property
+    def letter_distribution(self):
+        if self._letter_distribution is None:
+            self._letter_distribution = shard_letter_distribution(self.codes)
+        return self._letter_distribution
+
+    def word(self, i):
+        return self.codes[i].tobytes().decode('utf-32-le')
+
+    def sample(self, rng=random):
+        target = rng.random() * self.cumweights[-1]
+        i = int(np.searchsorted(self.cumweights, target, side='right'))
+        return self.word(min(i, len(self) - 1))
+
+    def _match_chunks(self, word_completion, guessed_letters, first_chunk=SCAN_CHUNK):
+        known = [(p, ord(c)) for p, c in enumerate(word_completion) if c != '_']
+        blanks = [p for p, c in enumerate(word_completion) if c == '_']
+        guessed = np.array([ord(c) for c in guessed_letters], dtype='<u4')
+        start, size = 0, first_chunk
+        while start < len(self):
+            chunk = self.codes[start:start + size]
+            mask = np.ones(len(chunk), dtype=bool)
+            for p, code in known:
+                mask &= chunk[:, p] == code
+            if blanks and len(guessed):
+                mask &= ~np.isin(chunk[:, blanks], guessed).any(axis=1)
+            yield start, mask
+            start += size
+            size = min(size * 4, SCAN_CHUNK)
+
+    def candidates(self, word_completion, guessed_letters):
+        matches = [start + np.flatnonzero(mask)
+                   for start, mask in self._match_chunks(word_completion, guessed_letters)]
+        return np.concatenate(matches) if matches else np.zeros(0, dtype=np.int64)
+
+    def count_candidates(self, word_completion, guessed_letters):
+        # Memoized: batch games revisit the same states again and again
+        key = (word_completion, tuple(guessed_letters))
+        count = self._counts.get(key)
+        if count is None:
+            if len(self._counts) >= COUNT_CACHE_SIZE:
+                self._counts.clear()
+            count = sum(int(mask.sum()) for _, mask in self._match_chunks(word_completion, guessed_letters))
+            self._counts[key] = count
+        return count
+
+    def top_likely_words(self, word_completion, guessed_letters, k=5):
+        # Heaviest first, so the first k matches are the k most likely words
+        top = []
+        for start, mask in self._match_chunks(word_completion, guessed_letters, EARLY_EXIT_CHUNK):
+            for i in np.flatnonzero(mask)[:k - len(top)]:
+                top.append((self.word(start + i), float(self.weights[start + i])))
+            if len(top) == k:
+                break
+        return top
+
+    def letter_scores(self, word_completion, guessed_letters):
+        # Total weight of the consistent words containing each unguessed letter,
+        # plus how many words matched
+        scores = Counter()
+        matched = 0
+        for start, mask in self._match_chunks(word_completion, guessed_letters):
+            rows = self.codes[start:start + len(mask)][mask]
+            weights = self.weights[start:start + len(mask)][mask]
+            matched += len(rows)
+            for code in np.unique(rows):
+                letter = chr(code)
+                if letter not in guessed_letters:
+                    scores[letter] += float(weights[(rows == code).any(axis=1)].sum())
+        return dict(scores), matched
+
+    def best_letter_from_likely_word(self, word_completion, guessed_letters):
+        # Only scans until the first match: a small prefix of the shard in the usual case
+        for start, mask in self._match_chunks(word_completion, guessed_letters, EARLY_EXIT_CHUNK):
+            hits = np.flatnonzero(mask)
+            if len(hits):
+                for letter in self.word(start + hits[0]):
+                    if letter not in guessed_letters:
+                        return letter
+                return None
+        return None
+
+
+def load_shard(shard_dir, length):
+    with open(os.path.join(shard_dir, 'letters.json'), encoding='utf-8') as f:
+        letter_distribution = json.load(f)
+    return VocabShard(
+        length,
+        np.load(os.path.join(shard_dir, 'codes.npy'), mmap_mode='r'),
+        np.load(os.path.join(shard_dir, 'weights.npy'), mmap_mode='r'),
+        np.load(os.path.join(shard_dir, 'cumweights.npy'), mmap_mode='r'),
+        letter_distribution,
+    )
+
+
+def shards_from_words(words, frequencies):
+    # In-memory shards with the same layout as the on-disk format
+    by_length = {}
+    for w, wt in zip(words, frequencies):
+        bucket = by_length.setdefault(len(w), ([], []))
+        bucket[0].append(w)
+        bucket[1].append(wt)
+
+    shards = {}
+    for length, (bucket_words, bucket_weights) in by_length.items():
+        codes = np.frombuffer("".join(bucket_words).encode('utf-32-le'), dtype='<u4')
+        codes = codes.reshape(len(bucket_words), length)
+        weights = np.asarray(bucket_weights, dtype=np.float64)
+        order = np.argsort(-weights, kind='stable')  # Ties keep dictionary order
+        shards[length] = VocabShard(length, codes[order], weights[order])
+    return shards
+
+
+class ShardedVocab:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self.lengths = sorted(int(length) for length in self.manifest["lengths"])
+        self.length_weights = [self.manifest["lengths"][str(length)]["total_weight"]
+                               for length in self.lengths]
+        self._shards = {}
+
+    def count(self, length):
+        entry = self.manifest["lengths"].get(str(length))
+        return entry["count"] if entry else 0
+
+    def shard(self, length):
+        if length not in self._shards:
+            self._shards[length] = load_shard(os.path.join(self.path, f'len_{length}'), length)
+        return self._shards[length]
+
+    def get(self, length, default=None):
+        # Same lookup as a {length: VocabShard} dict
+        return self.shard(length) if str(length) in self.manifest["lengths"] else default
+
+    def release(self, length):
+        self._shards.pop(length, None)
+
+    def loaded_lengths(self):
+        return sorted(self._shards)
+
+    def sample_length(self, rng=random):
+        # Length of a word drawn by weight, without loading any shard
+        return rng.choices(self.lengths, weights=self.length_weights, k=1)[0]
+
+    def sample_word(self, rng=random):
+        # Same weighted draw as random.choices(words, weights=frequencies)
+        return self.shard(self.sample_length(rng)).sample(rng)
+
+
+def vocab_dir_from_env():
+    # Set HANGMAN_VOCAB_DIR to a build_sharded_vocab() output to play from it
+    return os.environ.get(VOCAB_DIR_ENV) or None
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Usage: python sharded_vocab.py <words.csv> <out_dir> [--any-letters]")
+        sys.exit(1)
+    manifest = build_sharded_vocab(sys.argv[1], sys.argv[2],
+                                   require_vowel='--any-letters' not in sys.argv[3:])
+    total = sum(entry["count"] for entry in manifest["lengths"].values())
+    print(f"Wrote {total} words in {len(manifest['lengths'])} length shards to {sys.argv[2]}")
@@ -0,0 +1,155 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hangman_engine import GameState, MAX_ATTEMPTS
+
+_MISSING = object()
+
+
+def _state_key(state):
+    # Everything a guesser may look at; the secret word is deliberately left out
+    return state.word_completion, tuple(state.guessed_letters), state.attempts_remaining
+
+
+# --- Speculative next-guess precomputation ---
+class SpeculativeGuesser:
+    # Wraps a guess function guess_fn(state) -> letter. After the player commits
+    # to a letter, speculate() uses a worker thread to work out the next guess
+    # for every possible answer to it (each reveal pattern, or a miss), heaviest
+    # outcomes first. guess() then serves the matching branch if it is ready.
+    # Only the latest speculation is kept, capped at max_branches entries.
+    #
+    # This only pays off when the caller really is idle between speculate()
+    # and the next guess(), as in play_against_host() below: a remote host or
+    # a person answering the guess. Games that compute the answer locally and
+    # move straight on (the interactive bot and AI modes) never go idle, so
+    # they do not use it.
+    def __init__(self, guess_fn, solver, max_branches=32):
+        self.guess_fn = guess_fn
+        self.solver = solver
+        self.max_branches = max_branches
+        self.hits = 0
+        self.misses = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='speculate')
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._ready = {}
+        self._current = None  # (key, Event) of the branch being computed
+
+    def guess(self, state):
+        key = _state_key(state)
+        with self._lock:
+            letter = self._ready.get(key, _MISSING)
+            current = self._current
+        if letter is _MISSING and current is not None and current[0] == key:
+            # The worker is on exactly this branch: finishing it beats starting over
+            current[1].wait()
+            with self._lock:
+                letter = self._ready.get(key, _MISSING)
+        self.cancel()
+        if letter is not _MISSING:
+            self.hits += 1
+            return letter
+        self.misses += 1
+        return self.guess_fn(state)
+
+    def speculate(self, state, letter):
+        self.cancel()
+        cancel = threading.Event()
+        self._cancel = cancel
+        self._executor.submit(self._precompute, state, letter, cancel)
+
+    def cancel(self):
+        # Drops every unused branch; a branch already being computed is discarded
+        self._cancel.set()
+        with self._lock:
+            self._ready = {}
+
+    def close(self):
+        self.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _precompute(self, state, letter, cancel):
+        if cancel.is_set():
+            return
+        families = self.solver.reveal_families(state.word_completion, state.guessed_letters, letter)
+        guessed_letters = tuple(sorted(tuple(state.guessed_letters) + (letter,)))
+
+        for word_completion, _, _ in families[:self.max_branches]:
+            if cancel.is_set():
+                return
+            missed = word_completion == state.word_completion
+            next_state = state._replace(
+                word_completion=word_completion,
+                guessed_letters=guessed_letters,
+                attempts_remaining=state.attempts_remaining - int(missed),
+            )
+            if next_state.over:
+                continue
+            key = _state_key(next_state)
+            done = threading.Event()
+            with self._lock:
+                if cancel.is_set():
+                    return
+                self._current = (key, done)
+            try:
+                next_letter = self.guess_fn(next_state)
+                with self._lock:
+                    if not cancel.is_set():
+                        self._ready[key] = next_letter
+            finally:
+                with self._lock:
+                    self._current = None
+                done.set()
+
+
+# --- Example caller: the computer guesses, a slow host answers ---
+def play_against_host(speculator, length, answer, max_attempts=MAX_ATTEMPTS):
+    # answer(state, letter) blocks until the host replies with the new
+    # word_completion (unchanged on a miss). That wait, a person typing or a
+    # network round trip, is the idle time speculation fills.
+    state = GameState(None, "_" * length, (), max_attempts, max_attempts)
+    while not state.over:
+        letter = speculator.guess(state)
+        if letter is None or letter in state.guessed_letters:
+            break  # Nothing new to guess
+        speculator.speculate(state, letter)
+        word_completion = answer(state, letter)
+        missed = word_completion == state.word_completion
+        state = state._replace(
+            word_completion=word_completion,
+            guessed_letters=tuple(sorted(state.guessed_letters + (letter,))),
+            attempts_remaining=state.attempts_remaining - int(missed),
+        )
+    speculator.cancel()
+    return state
+
+
+def ask_host(state, letter):
+    # The host is a person at the keyboard who knows the secret word
+    while True:
+        reply = input(f"Is '{letter}' in your word? Type the word with it filled in "
+                      f"(now {state.word_completion}), or press Enter for no: ").strip().lower()
+        if not reply:
+            return state.word_completion
+        if len(reply) == len(state.word_completion) and letter in reply and all(
+            c == wc if wc != '_' else c in ('_', letter)
+            for c, wc in zip(reply, state.word_completion)
+        ):
+            return reply
+        print("That does not match the word so far. Only fill in the letter '" + letter + "'.")
+
+
+if __name__ == '__main__':
+    from Hangman import load_words
+    from hangman_solver import HangmanSolver
+
+    words, frequencies = load_words()
+    solver = HangmanSolver(words, frequencies)
+    length = int(input("Think of a word. How many letters does it have? "))
+    speculator = SpeculativeGuesser(
+        lambda state: solver.guess(state.word_completion, state.guessed_letters), solver
+    )
+    state = play_against_host(speculator, length, ask_host)
+    speculator.close()
+    print(f"Got it: {state.word_completion}" if state.won else "You win, I could not guess it.")
+    print(f"Speculation served {speculator.hits} of {speculator.hits + speculator.misses} guesses.")
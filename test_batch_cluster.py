@@ -0,0 +1,42 @@
+import os
+import random
+import shutil
+import pandas as pd
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def small_vocab(tmp_path, monkeypatch):
+    # Workers load unigram_freq.csv and letter_frequency.csv from the working directory
+    rng = random.Random(0)
+    with open(tmp_path / 'unigram_freq.csv', 'w') as f:
+        f.write("word,count\n")
+        for i in range(400):
+            word = "".join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 8)))
+            f.write(f"{word}a,{rng.randint(12711, 10 ** 7)}\n")
+    shutil.copy(os.path.join(REPO_DIR, 'letter_frequency.csv'), tmp_path)
+    monkeypatch.chdir(tmp_path)
+
+
+def test_cluster_with_crashing_worker_matches_local(small_vocab):
+    from batch_cluster import run_local, run_localhost_cluster
+
+    df, retries = run_localhost_cluster('bot', 200, workers=2, unit_size=20, seed=7, crash_after=1)
+    assert retries >= 1
+    pd.testing.assert_frame_equal(df, run_local('bot', 200, seed=7))
+
+
+def test_cluster_restarts_its_only_worker(small_vocab):
+    from batch_cluster import run_local, run_localhost_cluster
+
+    df, _ = run_localhost_cluster('bot', 60, workers=1, unit_size=20, seed=3, crash_after=0)
+    pd.testing.assert_frame_equal(df, run_local('bot', 60, seed=3))
+
+
+def test_cluster_fails_when_all_workers_are_gone(small_vocab):
+    from batch_cluster import run_localhost_cluster
+
+    with pytest.raises(RuntimeError):
+        run_localhost_cluster('bot', 200, workers=1, crash_after=0, max_restarts=0)
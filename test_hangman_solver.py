@@ -0,0 +1,52 @@
+import math
+import os
+import random
+import pytest
+from hangman_solver import HangmanSolver
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def random_states(words, count, seed=0):
+    rng = random.Random(seed)
+    states = []
+    for word in rng.choices(words, k=count):
+        guessed = sorted(set(rng.sample('abcdefghijklmnopqrstuvwxyz', rng.randint(0, 10))))
+        states.append(("".join(c if c in guessed else '_' for c in word), guessed))
+    return states
+
+
+def test_guess_batch_matches_scalar_ai(monkeypatch):
+    pytest.importorskip('torch')
+    monkeypatch.chdir(REPO_DIR)  # aihangman_py reads letter_frequency.csv on import
+    import aihangman_py
+
+    rng = random.Random(1)
+    words = sorted({"".join(rng.choice('abcdefghij') for _ in range(rng.randint(3, 6)))
+                    for _ in range(600)})
+    frequencies = [rng.uniform(0.1, 10) for _ in words]
+    ai_dist = aihangman_py.train_ai_by_word_length(words)
+    states = random_states(words, 400)
+    # Out-of-vocabulary patterns force the fallback distribution
+    states += [("zz_", ['z']), ("_a_q", ['a', 'q'])]
+
+    guesses, scores = HangmanSolver(words, frequencies).guess_batch(states, return_scores=True)
+    for (word_completion, guessed), guess, score in zip(states, guesses, scores):
+        expected = aihangman_py.get_ai_guess_from_distribution(
+            ai_dist, word_completion, guessed, words, frequencies
+        )
+        if guess != expected:
+            # The scalar AI breaks exact ties in set order; only ties may differ
+            assert math.isclose(score[guess], score[expected], rel_tol=1e-9)
+
+
+def test_letter_outside_alphabet_matches_nothing():
+    solver = HangmanSolver(['cat', 'cot', 'dog'], [1.0, 2.0, 3.0])
+    assert solver.candidates('é__', ['é']) == []
+    assert solver.reveal_families('é__', ['é'], 'o') == []
+
+    guesses, scores = solver.guess_batch([('é__', ['é'])], return_scores=True)
+    bucket = solver._bucket(3)
+    fallback = {letter: float(bucket.distribution[i]) for i, letter in enumerate(bucket.alphabet)}
+    assert scores[0] == fallback
+    assert guesses[0] == max(fallback, key=fallback.get)
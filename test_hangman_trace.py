@@ -0,0 +1,23 @@
+import pytest
+from hangman_trace import TraceRecorder, replay_game
+
+LONG_WORD = "pneumonoultramicroscopicsilicovolcanoconiosis"
+
+
+def test_long_word_round_trips(tmp_path):
+    with TraceRecorder(str(tmp_path), max_word_length=len(LONG_WORD)) as trace:
+        for step, letter in enumerate("aeiou"):
+            trace.record_guess(7, step, letter, 1, -1, 1.0)
+        trace.record_game(7, LONG_WORD, 0)
+
+    game = replay_game(str(tmp_path), 7)
+    assert game["word"] == LONG_WORD
+    assert game["steps"][-1]["word_completion"] == "".join(
+        c if c in "aeiou" else "_" for c in LONG_WORD
+    )
+
+
+def test_word_longer_than_column_raises(tmp_path):
+    with TraceRecorder(str(tmp_path), max_word_length=32) as trace:
+        with pytest.raises(ValueError):
+            trace.record_game(0, LONG_WORD, 1)
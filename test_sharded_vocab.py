@@ -0,0 +1,25 @@
+import os
+import pytest
+from sharded_vocab import shards_from_words
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_shards_are_heaviest_first_with_early_exit():
+    shards = shards_from_words(['cat', 'cot', 'dog', 'cut'], [1.0, 3.0, 2.0, 3.0])
+    shard = shards[3]
+    assert [shard.word(i) for i in range(len(shard))] == ['cot', 'cut', 'dog', 'cat']
+    assert shard.top_likely_words('c_t', [], k=2) == [('cot', 3.0), ('cut', 3.0)]
+    assert shard.best_letter_from_likely_word('c_t', ['c', 't']) == 'o'
+    assert shard.count_candidates('c_t', ['c', 't', 'o']) == 2
+
+
+def test_ai_fallback_uses_the_shard_alphabet(monkeypatch):
+    pytest.importorskip('torch')
+    monkeypatch.chdir(REPO_DIR)  # aihangman_py reads letter_frequency.csv on import
+    import aihangman_py
+
+    shard = shards_from_words(['été', 'thé', 'éré'], [1.0, 1.0, 1.0])[3]
+    # No word matches 'q__', so the guess comes from the letter shares alone
+    assert aihangman_py.get_ai_guess_from_shard(shard, 'q__', ['q']) == 'é'
+    assert aihangman_py.get_ai_guess_from_shard(None, '___', ['a']) == 'b'
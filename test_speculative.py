@@ -0,0 +1,121 @@
+import threading
+import time
+from hangman_engine import new_game, apply_guess
+from hangman_solver import HangmanSolver
+from speculative import SpeculativeGuesser, play_against_host
+
+
+class FakeSolver:
+    # Answers reveal_families() with a fixed list of outcomes
+    def __init__(self, patterns):
+        self.patterns = patterns
+
+    def reveal_families(self, word_completion, guessed_letters, letter):
+        return [(pattern, 1.0, 1) for pattern in self.patterns]
+
+
+class CountingGuess:
+    def __init__(self, block_first=False):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block_first:
+            self.release.set()
+
+    def __call__(self, state):
+        self.calls.append(state.word_completion)
+        self.started.set()
+        self.release.wait()
+        return 'z'
+
+
+def drain(speculator):
+    # The worker is a single thread, so an empty task runs after the speculation
+    speculator._executor.submit(lambda: None).result()
+
+
+def next_state(state, word_completion, letter):
+    return state._replace(word_completion=word_completion,
+                          guessed_letters=tuple(sorted(state.guessed_letters + (letter,))))
+
+
+def test_ready_branch_is_served_without_recomputing():
+    guess_fn = CountingGuess()
+    speculator = SpeculativeGuesser(guess_fn, FakeSolver(['a__', '__a']))
+    state = new_game('abc')
+    speculator.speculate(state, 'a')
+    drain(speculator)
+
+    assert speculator.guess(next_state(state, 'a__', 'a')) == 'z'
+    assert (speculator.hits, speculator.misses) == (1, 0)
+    assert guess_fn.calls == ['a__', '__a']
+    speculator.close()
+
+
+def test_guess_waits_for_the_branch_being_computed():
+    guess_fn = CountingGuess(block_first=True)
+    speculator = SpeculativeGuesser(guess_fn, FakeSolver(['a__']))
+    state = new_game('abc')
+    speculator.speculate(state, 'a')
+    guess_fn.started.wait(5)
+
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(speculator.guess(next_state(state, 'a__', 'a'))))
+    waiter.start()
+    time.sleep(0.05)
+    assert waiter.is_alive()  # Waiting on the worker rather than computing again
+    guess_fn.release.set()
+    waiter.join(5)
+
+    assert result == ['z']
+    assert speculator.hits == 1
+    assert guess_fn.calls == ['a__']
+    speculator.close()
+
+
+def test_cancel_drops_unused_branches():
+    guess_fn = CountingGuess(block_first=True)
+    speculator = SpeculativeGuesser(guess_fn, FakeSolver(['a__', '_a_', '__a']))
+    state = new_game('abc')
+    speculator.speculate(state, 'a')
+    guess_fn.started.wait(5)
+    speculator.cancel()
+    guess_fn.release.set()
+    drain(speculator)
+
+    assert guess_fn.calls == ['a__']  # Later branches never started
+    assert speculator._ready == {}
+    speculator.guess(next_state(state, 'a__', 'a'))
+    assert (speculator.hits, speculator.misses) == (0, 1)
+    speculator.close()
+
+
+def test_branches_are_capped():
+    guess_fn = CountingGuess()
+    patterns = ['a' * n + '_' * (10 - n) for n in range(10)]
+    speculator = SpeculativeGuesser(guess_fn, FakeSolver(patterns), max_branches=3)
+    speculator.speculate(new_game('a' * 10), 'a')
+    drain(speculator)
+
+    assert len(guess_fn.calls) == 3
+    assert len(speculator._ready) == 3
+    speculator.close()
+
+
+def test_slow_host_is_served_from_speculation():
+    words = ['cat', 'cot', 'cut', 'dog', 'dig', 'dug', 'hat', 'hot', 'hut']
+    solver = HangmanSolver(words, [1.0] * len(words))
+    speculator = SpeculativeGuesser(
+        lambda state: solver.guess(state.word_completion, state.guessed_letters), solver
+    )
+    secret = new_game('hut')
+
+    def answer(state, letter):
+        time.sleep(0.02)  # Host round trip
+        return apply_guess(secret._replace(word_completion=state.word_completion), letter)[0].word_completion
+
+    state = play_against_host(speculator, 3, answer)
+    speculator.close()
+    assert state.won and state.word_completion == 'hut'
+    assert speculator.hits >= 1
+    assert speculator.hits + speculator.misses == len(state.guessed_letters)